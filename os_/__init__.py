@@ -1,5 +1,6 @@
 from os_.driver import OSDriver
+from os_.scheduling_policy import SchedulingPolicy
 
 
-def create_os(program_file: str) -> OSDriver:
-    return OSDriver(program_file)
+def create_os(program_file: str, policy: SchedulingPolicy = None) -> OSDriver:
+    return OSDriver(program_file, policy)
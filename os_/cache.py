@@ -1,4 +1,5 @@
 from os_.page import Page
+from os_.output import format_word
 from os_.logical_address import LogicalAddress
 from os_.sync_print import sync_print
 from os_.config import PAGE_SIZE
@@ -6,15 +7,19 @@ from os_.config import PAGE_SIZE
 
 class Cache:
 
-    # Largest job has 72 words, each page has 4 words,
-    # such that having 18 cache indexes should be optimal.
+    # One page per page of the job, indexed by logical page number.
+    # With CPU_CACHE_LINES > 0 the CPUCache of the CPU decides which
+    # of them are valid. A page written back is clean again, but stays
+    # written for the life of the job, see BlockTranslator.
 
-    CACHE_SIZE = 72 // PAGE_SIZE
+    def __init__(self, page_count: int = 0):
+        self.cache: list = [Page() for i in range(page_count)]
+        self.valid: list = [False for i in range(page_count)]
+        self.dirty: list = [False for i in range(page_count)]
+        self.written: list = [False for i in range(page_count)]
 
-    def __init__(self):
-        self.cache: list = [Page() for i in range(self.CACHE_SIZE)]
-        self.valid: list = [False for i in range(self.CACHE_SIZE)]
-        self.dirty: list = [False for i in range(self.CACHE_SIZE)]
+    def __len__(self):
+        return self.cache.__len__()
 
     def set_valid_page(self, page_num: int, is_page_valid: bool):
         self.valid[page_num] = is_page_valid
@@ -22,19 +27,31 @@ class Cache:
     def set_dirty_page(self, page_num: int, is_dirty_page: bool):
         self.dirty[page_num] = is_dirty_page
 
+    def load_page(self, page_num: int, page: Page):
+        """     Copies a whole page in one slice, a valid and clean page of PAGE_SIZE words.     """
+        self.cache[page_num].copy_from(page)
+        self.cache[page_num].used = PAGE_SIZE
+        self.valid[page_num] = True
+        self.dirty[page_num] = False
+
     def read_page(self, page_num: int) -> Page:
         return self.cache[page_num]
 
-    def read_cache(self, logical_address: LogicalAddress) -> str:
+    def read_cache(self, logical_address: LogicalAddress) -> int:
         page_num = logical_address.get_page_number()
         page_offset = logical_address.get_page_offset()
         return self.cache[page_num].read_page(index=page_offset)
 
-    def write_cache(self, logical_address: LogicalAddress, data: str):
+    def write_cache(self, logical_address: LogicalAddress, data: int):
         page_num = logical_address.get_page_number()
         offset = logical_address.get_page_offset()
         self.cache[page_num].write_page(index=offset, instruction=data)
         self.set_dirty_page(page_num, is_dirty_page=True)
+        self.written[page_num] = True
+
+    def get_dirty_pages(self) -> list:
+        """     Valid pages written since they were loaded or last written back.     """
+        return [i for i in range(len(self.cache)) if self.dirty[i] is True and self.valid[i] is True]
 
     def is_page_valid(self, **kwargs) -> bool:
         logical_address: LogicalAddress = kwargs.get('logical_address', None)
@@ -67,7 +84,7 @@ class Cache:
         sync_print('------------------------------')
         for page in self.cache:
             for i in range(4):
-                sync_print(page.page[i])
+                sync_print(format_word(page.read_page(i)))
         sync_print('------------------------------')
 
 
@@ -7,6 +7,7 @@ CPU_COUNT = 4
 
 # ---------------- #
 # -- Scheduling
+# -- RR
 # -- FIFO
 # -- SJF
 # -- Priority
@@ -14,12 +15,180 @@ CPU_COUNT = 4
 
 SCHEDULING_TYPE = 'SJF'
 
+# ------------------------------------------------- #
+# -- Round robin time slice, in instructions a   -- #
+# -- job runs before it is preempted back to     -- #
+# -- READY. 0 runs every job until it halts or   -- #
+# -- is interrupted. Use with SCHEDULING_TYPE RR -- #
+# -- for plain round robin.                      -- #
+# ------------------------------------------------- #
+
+TIME_QUANTUM = 0
+
+# ------------------------------------------------- #
+# -- Work stealing, a CPU with nothing of its    -- #
+# -- own to dispatch takes the best runnable job -- #
+# -- (READY, or WAITING on pages that arrived)   -- #
+# -- of the peer with the most of them. Peers    -- #
+# -- keep STEAL_AFFINITY of them, so a job stays -- #
+# -- on the CPU it warmed up unless the backlog  -- #
+# -- there grows past that.                      -- #
+# ------------------------------------------------- #
+
+WORK_STEALING = False
+STEAL_AFFINITY = 1
+
+# ---------------------- #
+# -- Execution Engine
+# -- Dispatch
+# -- Reference
+# -- Translated
+# ---------------------- #
+
+EXECUTION_ENGINE = 'Dispatch'
+
+# ---------------------- #
+# -- CPU Bank
+# -- Threaded
+# -- Process
+# ---------------------- #
+
+CPU_BANK = 'Threaded'
+
+# ---------------------- #
+# -- Driver Mode
+# -- Threaded
+# -- Event
+# ---------------------- #
+
+DRIVER_MODE = 'Threaded'
+
+# ------------------------------------------------- #
+# -- Boot from a compiled binary job image,      -- #
+# -- cached next to the job file with JOB_IMAGE_ -- #
+# -- SUFFIX and rebuilt when the job file is     -- #
+# -- newer than it.                              -- #
+# ------------------------------------------------- #
+
+JOB_IMAGE = False
+JOB_IMAGE_SUFFIX = '.img'
+
+# ------------------------------------------------- #
+# -- Disk backing file, None keeps the Disk in   -- #
+# -- memory. A file is memory-mapped and kept    -- #
+# -- between runs, every run loads its jobs      -- #
+# -- after the pages already on it.              -- #
+# -- DISK_CAPACITY in pages, None is the default -- #
+# -- of 612 pages for one job file.              -- #
+# ------------------------------------------------- #
+
+DISK_FILE = None
+DISK_CAPACITY = None
+
+# ------------------------------------------------- #
+# -- Page replacement once RAM is full, so decks -- #
+# -- larger than RAM can run                     -- #
+# -- None, wait for a job to end and free frames -- #
+# -- Clock                                       -- #
+# -- LRU                                         -- #
+# -- WorkingSet, frames not referenced in the    -- #
+# --   last WORKING_SET_WINDOW frame references  -- #
+# --   go first                                  -- #
+# ------------------------------------------------- #
+
+PAGE_REPLACEMENT = None
+WORKING_SET_WINDOW = 64
+
+# ------------------------------------------------- #
+# -- Readahead, a sequential page fault also     -- #
+# -- loads up to READAHEAD_PAGES following pages -- #
+# -- of the job into free frames. The window per -- #
+# -- job starts at 1 page and adapts to how      -- #
+# -- many prefetched pages are touched. 0 turns  -- #
+# -- it off.                                     -- #
+# ------------------------------------------------- #
+
+READAHEAD_PAGES = 0
+
+# ------------------------------------------------- #
+# -- DMA channels copying pages from RAM into    -- #
+# -- the caches, each serves one IO request at a -- #
+# -- time                                        -- #
+# ------------------------------------------------- #
+
+DMA_CHANNELS = 1
+
+# ------------------------------------------------- #
+# -- CPU cache, CPU_CACHE_LINES pages per CPU in -- #
+# -- sets of CPU_CACHE_WAYS lines, evicted by    -- #
+# -- CPU_CACHE_REPLACEMENT, LRU, FIFO or Random. -- #
+# -- 0 keeps every page a job was given cached.  -- #
+# ------------------------------------------------- #
+
+CPU_CACHE_LINES = 0
+CPU_CACHE_WAYS = 4
+CPU_CACHE_REPLACEMENT = 'LRU'
+
+# ------------------------------------------------- #
+# -- TLB, TLB_ENTRIES page translations per CPU, -- #
+# -- evicted by TLB_REPLACEMENT, LRU, FIFO or    -- #
+# -- Random. 0 translates through the PageTable. -- #
+# ------------------------------------------------- #
+
+TLB_ENTRIES = 16
+TLB_REPLACEMENT = 'LRU'
+
+# ------------------------------------------------- #
+# -- Write-back, a job leaving its CPU with      -- #
+# -- WRITE_BACK_THRESHOLD or more dirty cache    -- #
+# -- pages has them written to RAM in the        -- #
+# -- background, and every WRITE_BACK_INTERVAL   -- #
+# -- seconds (ticks for the event driver) the    -- #
+# -- dirty pages of all jobs off a CPU are. 0    -- #
+# -- turns either off, leaving them to HLT.      -- #
+# ------------------------------------------------- #
+
+WRITE_BACK_THRESHOLD = 0
+WRITE_BACK_INTERVAL = 0
+
+# ------------------------------------------------- #
+# -- Page deduplication, byte-identical pages of -- #
+# -- all jobs share one Disk page, and pages of  -- #
+# -- instructions / input buffers one RAM frame, -- #
+# -- copied on write                             -- #
+# ------------------------------------------------- #
+
+PAGE_DEDUP = False
+
+# ------------------------------------------------- #
+# -- Performance counters, per thread and summed -- #
+# -- at the end of the run, exported as JSON to  -- #
+# -- PERF_COUNTERS_FILE next to the dumps        -- #
+# ------------------------------------------------- #
+
+PERF_COUNTERS = True
+PERF_COUNTERS_FILE = 'perf_counters.json'
+
+# ----------------------------------------- #
+# -- Event driver costs, in simulated    -- #
+# -- ticks, an instruction takes 1 tick  -- #
+# ----------------------------------------- #
+
+IO_PAGE_TICKS = 4
+PAGE_FAULT_TICKS = 16
+
 # --------------- #
 # -- PAGE SIZE -- #
 # --------------- #
 
 PAGE_SIZE = 4
 
+# --------------------------------------- #
+# -- WORD SIZE, words are 32-bit ints  -- #
+# --------------------------------------- #
+
+WORD_MASK = 0xFFFFFFFF
+
 # ---------------- #
 # -- PCB States -- #
 # ---------------- #
@@ -36,6 +205,16 @@ ENDED_STATE = 'ENDED_STATE'
 
 EMPTY = None
 
+# --------------------------------------------- #
+# -- One thread drives the Event mode, so    -- #
+# -- @synchronized skips its locks. Set it   -- #
+# -- before any decorated module is imported -- #
+# --------------------------------------------- #
+
+if DRIVER_MODE == 'Event':
+    from os_ import synchronization
+    synchronization.LOCK_MODE = 'None'
+
 # ---------------------------- #
 # -- Initialize DUMP object -- #
 # ---------------------------- #
@@ -51,3 +230,11 @@ CORE_DUMPS = Output()
 from os_.statistics import Statistics
 
 statistics = Statistics()
+
+# ------------------------------------ #
+# -- Initialize Decode Cache object -- #
+# ------------------------------------ #
+
+from os_.instruction import DecodeCache
+
+DECODE_CACHE = DecodeCache()
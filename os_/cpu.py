@@ -1,10 +1,25 @@
+import threading
 from os_ import alu
 from os_.mmu import MMU
 from os_.pcb import PCB
 from os_.cpu_state import CPUState
 from os_.cache import Cache
+from os_.cpu_cache import CPUCache
+from os_.tlb import TLB
+from os_.instruction import Instruction, dispatch_key
 from os_.logical_address import LogicalAddress
-from os_.config import ENDED_STATE
+from os_.translator import BlockTranslator
+from os_.config import (
+    ENDED_STATE,
+    EXECUTION_ENGINE,
+    TIME_QUANTUM,
+    CPU_CACHE_LINES,
+    CPU_CACHE_WAYS,
+    CPU_CACHE_REPLACEMENT,
+    TLB_ENTRIES,
+    TLB_REPLACEMENT,
+    statistics,
+)
 from os_.synchronization import synchronized
 from os_.sync_print import sync_print
 
@@ -27,126 +42,484 @@ class CPU:
         self.cpu_is_interrupted = False
         self.current_pcb = None
 
+        # -- Instructions left in the time slice of current_pcb -- #
+        self.quantum_left = float('inf')
+
+        # -- Handoff between dispatcher and CPU, idle threads block -- #
+        self.process_ready = threading.Event()
+        self.process_idle = threading.Event()
+        self.process_idle.set()
+
+        # -- Last cache page a fetch was validated on by the MMU -- #
+        self.resident_page = None
+
+        # -- Set-associative cache, None keeps every page of a job cached. -- #
+        # -- A worker process has no kernel, its proxy CPU holds the cache -- #
+        self.cpu_cache = None
+        if CPU_CACHE_LINES > 0 and mmu.kernel is not None:
+            self.cpu_cache = CPUCache(
+                cpu_id=id_,
+                ram=mmu.ram,
+                lines=CPU_CACHE_LINES,
+                ways=CPU_CACHE_WAYS,
+                replacement=CPU_CACHE_REPLACEMENT,
+            )
+            mmu.kernel.register_cpu_cache(self.cpu_cache)
+        self.tlb = None
+        if TLB_ENTRIES > 0 and mmu.kernel is not None:
+            self.tlb = TLB(cpu_id=id_, capacity=TLB_ENTRIES, replacement=TLB_REPLACEMENT)
+            mmu.kernel.register_tlb(self.tlb)
+
+        # -- Execution Engine -- #
+        self.dispatch_table = self.build_dispatch_table()
+        self.translator = None
+        if EXECUTION_ENGINE == 'Dispatch':
+            self.execute = self.execute_dispatch
+        elif EXECUTION_ENGINE == 'Reference':
+            self.execute = self.execute_reference
+        elif EXECUTION_ENGINE == 'Translated':
+            self.execute = self.execute_dispatch
+            self.translator = BlockTranslator()
+        else:
+            raise UnexpectedCPUError(f'Unsupported EXECUTION_ENGINE {EXECUTION_ENGINE}.')
+        if self.translator is not None and mmu.kernel is not None:
+            mmu.kernel.register_translator(id_, self.translator)
+
         # -- DEBUGGING -- #
         self.jobs_completed = 0
+        self.instructions_executed = 0
+        self.fetches = 0
+        self.interrupt_checks_avoided = 0
+        self.preemptions = 0
+        self.busy_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.interrupts = 0
+        self.cache_counters = (0, 0)
+        # -- Instructions retired per instruction format, see perf_counters.OPCODE_CLASSES -- #
+        self.format_counts = [0, 0, 0, 0]
+        self.context_switches = 0
 
     @synchronized
     def end_cpu(self):
         self.is_running = False
+        self.process_ready.set()
 
     def run(self):
         while self.is_running is True:
+            self.process_ready.wait()
             if self.is_process_running() is True:
                 self.initialize_cpu()
+                started = statistics.clock()
                 self.run_process()
+                self.busy_time += statistics.clock() - started
+                self.account_cache()
+                self.mmu.switch_out(self.current_pcb)
                 self.set_process_running(False)
+                # -- current_pcb left RUNNING, wake dispatchers waiting on it -- #
+                self.mmu.kernel.notify_dispatchers()
 
     @synchronized
     def run_pcb(self, pcb: PCB):
-        while self.is_spinning is True:
-            pass
+        self.wait_until_idle()
         self.current_pcb = pcb
         self.set_process_running(True)
 
+    def wait_until_idle(self):
+        self.process_idle.wait()
+
     def initialize_cpu(self):
+        self.context_switches += 1
         # -- Set CPU State -- #
         self.cpu_state = self.current_pcb.get_cpu_state()
         # -- Set Cache from CPU State -- #
         self.cache = self.cpu_state.get_cache()
+        self.resident_page = None
+        self.quantum_left = TIME_QUANTUM if TIME_QUANTUM > 0 else float('inf')
+        if self.cpu_cache is not None:
+            self.cpu_cache.attach(self.current_pcb, self.mmu.kernel.cpu_caches)
+        self.cache_counters = (self.get_cache_hits(), self.cache_misses)
         # -- Copy Program Counter -- #
         self.cpu_state.set_pc(self.cpu_state.get_pc())
         # -- Copy Registers -- #
         for i in range(CPUState.REGISTER_COUNT):
             self.cpu_state.set_register(index=i, value=self.cpu_state.get_register(index=i))
 
+    def account_cache(self):
+        """     Adds the cache hits / misses since initialize_cpu(...) to current_pcb.     """
+        hits, misses = self.cache_counters
+        self.current_pcb.cache_hits += self.get_cache_hits() - hits
+        self.current_pcb.cache_misses += self.cache_misses - misses
+        if self.cpu_cache is not None:
+            self.cpu_cache.detach()
+
+    def get_cache_hits(self) -> int:
+        """     Page lookups that found the page valid, fetches on the resident page included.     """
+        return self.cache_hits + self.interrupt_checks_avoided
+
     def is_process_running(self) -> bool:
         return self._is_running_process
 
     @synchronized
     def set_process_running(self, b: bool):
         self._is_running_process = b
+        if b is True:
+            self.process_idle.clear()
+            self.process_ready.set()
+        else:
+            self.process_ready.clear()
+            self.process_idle.set()
 
     def run_process(self):
         self.is_spinning = True
+        if self.translator is not None:
+            self.run_translated()
+            return
+        while self.is_spinning is True:
+            self.step()
+
+    def run_translated(self):
+        """
+            Runs translated basic blocks, falling back to step(...)
+            whenever a block can not be used at the current pc.
+        """
+        translator = self.translator
+        cache = self.cache
+        job_id = self.current_pcb.job_id
         while self.is_spinning is True:
-            pc = self.cpu_state.get_pc()
-            instruction_str = self.fetch(address=self.cpu_state.get_pc())
-
-            self.cpu_state.increment_pc()
-            if self.cpu_is_interrupted is False:
-                self.decode(instruction_str)
-                instruction = self.cpu_state.get_instruction()
-                sync_print(
-                    f'DEBUG: [CPU_ID {self.cpu_id} PID {self.current_pcb.job_id} pc {pc}]'
-                    f' Fetch {instruction_str} -> {instruction}'
-                ) if CPU_DEBUG is True else None
-
-                if instruction.format == '0x0':
-                    self.execute_arithmetic(
-                        opcode_hex=instruction.opcode,
-                        s1_hex=instruction.reg1,
-                        s2_hex=instruction.reg2,
-                        dr_hex=instruction.address,
-                    )
-                elif instruction.format == '0x1':
-                    self.execute_conditional_branch(
-                        opcode_hex=instruction.opcode,
-                        br_hex=instruction.breg,
-                        dr_hex=instruction.dstreg,
-                        address_hex=instruction.address,
-                    )
-                elif instruction.format == '0x2':
-                    self.execute_unconditional_jump(
-                        opcode_hex=instruction.opcode,
-                        address_hex=instruction.address,
-                    )
-                elif instruction.format == '0x3':
-                    self.execute_io(
-                        opcode_hex=instruction.opcode,
-                        r1_hex=instruction.reg1,
-                        r2_hex=instruction.reg2,
-                        address_hex=instruction.address
-                    )
-                else:
-                    raise UnexpectedCPUError(
-                        f'run_process(...) unable to match instruction->format {instruction.format}.'
-                    )
+            block = translator.get_block(job_id=job_id, pc=self.cpu_state.pc, cache=cache)
+            if block is not None:
+                translator.blocks_executed += 1
+                self.cpu_state.pc, retired, fall_back = block.run(
+                    self.cpu_state.registers, cache.cache, cache.valid, cache.dirty, cache.written
+                )
+                self.instructions_executed += retired
+                self.quantum_left -= retired
+                arithmetic, branch, jump, io = block.format_counts[retired]
+                format_counts = self.format_counts
+                format_counts[0] += arithmetic
+                format_counts[1] += branch
+                format_counts[2] += jump
+                format_counts[3] += io
+                # -- Every fetch of a block hits, its guards checked the pages -- #
+                self.cache_hits += retired
+                if self.quantum_left <= 0:
+                    # -- Blocks are not split, a slice may run over by one block -- #
+                    self.preempt()
+                    continue
+                if fall_back is False:
+                    continue
+                translator.fallbacks += 1
+            self.step()
+
+    def step(self):
+        """     Fetch, decode and execute a single instruction.     """
+        pc = self.cpu_state.get_pc()
+        word = self.fetch(address=self.cpu_state.get_pc())
+
+        self.cpu_state.increment_pc()
+        if self.cpu_is_interrupted is False:
+            self.decode(word)
+            instruction = self.cpu_state.get_instruction()
+            sync_print(
+                f'DEBUG: [CPU_ID {self.cpu_id} PID {self.current_pcb.job_id} pc {pc}]'
+                f' Fetch {hex(word)} -> {instruction}'
+            ) if CPU_DEBUG is True else None
+
+            self.execute(instruction)
 
-            if self.cpu_is_interrupted is True:
-                self.cpu_state.decrement_pc()
-                self.cpu_is_interrupted = False
+        if self.cpu_is_interrupted is True:
+            self.cpu_state.decrement_pc()
+            self.cpu_is_interrupted = False
+        else:
+            self.instructions_executed += 1
+            self.format_counts[instruction.format] += 1
+            self.quantum_left -= 1
+            if self.quantum_left <= 0 and self.is_spinning is True:
+                self.preempt()
+
+    def preempt(self):
+        """     Ends the time slice, the saved cpu_state resumes at pc.     """
+        self.is_spinning = False
+        self.preemptions += 1
+        self.mmu.preempt(self.current_pcb)
 
-    def fetch(self, address: int) -> str:
+    def fetch(self, address: int) -> int:
+        self.fetches += 1
         self.logical_address.convert_from_raw_address(address)
-        self.handle_interrupt(self.logical_address)
+        page_num = self.logical_address.get_page_number()
+        # -- Fast path, still on the page the MMU last validated -- #
+        if page_num == self.resident_page and self.cache.valid[page_num] is True:
+            self.interrupt_checks_avoided += 1
+        else:
+            self.handle_interrupt(self.logical_address)
+            self.resident_page = None if self.cpu_is_interrupted is True else page_num
         return self.mmu.read_cache(logical_address=self.logical_address, cache=self.cache)
 
-    def decode(self, instruction: str):
+    def decode(self, word: int):
         if self.cpu_is_interrupted is True:
             return
-        self.cpu_state.set_instruction(instruction)
+        self.cpu_state.set_instruction(word)
 
     def handle_interrupt(self, logical_address: LogicalAddress):
         if self.mmu.check_for_interrupt(logical_address, self.cache, self.current_pcb) is True:
             self.is_spinning = False
             self.cpu_is_interrupted = True
+            self.interrupts += 1
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
+            if self.cpu_cache is not None:
+                self.cpu_cache.reference(self.current_pcb, logical_address.get_page_number())
+
+    # ---------------------- #
+    # -- Dispatch Engine  -- #
+    # ---------------------- #
+
+    def execute_dispatch(self, instruction: Instruction):
+        """     Dispatch engine, one table lookup per instruction.     """
+        self.dispatch_table[instruction.key](instruction)
+
+    def build_dispatch_table(self) -> list:
+        handlers = {
+            # -- Arithmetic format -- #
+            (0x0, 0x4): self.op_mov,
+            (0x0, 0x5): self.op_add,
+            (0x0, 0x6): self.op_sub,
+            (0x0, 0x7): self.op_mul,
+            (0x0, 0x8): self.op_div,
+            (0x0, 0x9): self.op_and,
+            (0x0, 0xa): self.op_or,
+            (0x0, 0x10): self.op_slt,
+            # -- Conditional Branch and Immediate format -- #
+            (0x1, 0x2): self.op_st,
+            (0x1, 0x3): self.op_lw,
+            (0x1, 0xb): self.op_movi,
+            (0x1, 0xc): self.op_addi,
+            (0x1, 0xd): self.op_muli,
+            (0x1, 0xe): self.op_divi,
+            (0x1, 0xf): self.op_ldi,
+            (0x1, 0x11): self.op_slti,
+            (0x1, 0x15): self.op_beq,
+            (0x1, 0x16): self.op_bne,
+            (0x1, 0x17): self.op_bez,
+            (0x1, 0x18): self.op_bnz,
+            (0x1, 0x19): self.op_bgz,
+            (0x1, 0x1a): self.op_blz,
+            # -- Unconditional Jump format -- #
+            (0x2, 0x12): self.op_hlt,
+            (0x2, 0x14): self.op_jmp,
+            # -- Input and Output format -- #
+            (0x3, 0x0): self.op_rd,
+            (0x3, 0x1): self.op_wr,
+        }
+        table = [self.op_undefined for i in range(256)]
+        for (format_, opcode), handler in handlers.items():
+            table[dispatch_key(format_, opcode)] = handler
+        return table
+
+    def op_undefined(self, instruction: Instruction):
+        raise UnexpectedCPUError(
+            f'execute_dispatch(...) unable to match format {hex(instruction.format)} '
+            f'opcode {hex(instruction.opcode)}.'
+        )
+
+    # -- Arithmetic format, the D-reg is taken from the address field -- #
+    # -- exactly like execute_reference(...) does.                     -- #
+
+    def op_mov(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.reg1] = registers[instruction.reg2]
+
+    def op_add(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.address] = alu.add(registers[instruction.reg1], registers[instruction.reg2])
+
+    def op_sub(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.address] = alu.sub(registers[instruction.reg1], registers[instruction.reg2])
+
+    def op_mul(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.address] = alu.multi(registers[instruction.reg1], registers[instruction.reg2])
+
+    def op_div(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.address] = alu.div(registers[instruction.reg1], registers[instruction.reg2])
+
+    def op_and(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.address] = alu.and_operator(registers[instruction.reg1], registers[instruction.reg2])
+
+    def op_or(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.address] = alu.or_operator(registers[instruction.reg1], registers[instruction.reg2])
+
+    def op_slt(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.address] = 1 if alu.less_than(
+            registers[instruction.reg1], registers[instruction.reg2]
+        ) else 0
+
+    # -- Conditional Branch and Immediate format -- #
+
+    def op_st(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        self.logical_address.convert_from_raw_address(registers[instruction.dstreg] // 4)
+        self.handle_interrupt(self.logical_address)
+        if self.cpu_is_interrupted is True:
+            return
+        self.mmu.write_cache(
+            logical_address=self.logical_address,
+            data=registers[instruction.breg],
+            cache=self.cache
+        )
+
+    def op_lw(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        self.logical_address.convert_from_raw_address(registers[instruction.breg] // 4)
+        self.handle_interrupt(self.logical_address)
+        if self.cpu_is_interrupted is True:
+            return
+        self.mmu.read_cache(logical_address=self.logical_address, cache=self.cache)
+
+    def op_movi(self, instruction: Instruction):
+        self.cpu_state.registers[instruction.dstreg] = instruction.address
+
+    def op_addi(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.dstreg] = alu.add(registers[instruction.dstreg], instruction.address)
+
+    def op_muli(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.dstreg] = alu.multi(registers[instruction.dstreg], instruction.address)
+
+    def op_divi(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.dstreg] = alu.div(registers[instruction.dstreg], instruction.address)
+
+    def op_ldi(self, instruction: Instruction):
+        self.cpu_state.registers[instruction.dstreg] = instruction.address
+
+    def op_slti(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        registers[instruction.dstreg] = 1 if alu.less_than(registers[instruction.breg], instruction.address) else 0
 
-    def execute_io(self, opcode_hex: str, r1_hex: str, r2_hex: str, address_hex: str):
-        # -- Convert HEX to INT -- #
-        r1_int = int(r1_hex, 0)
-        r2_int = int(r2_hex, 0)
-        address_int = int(address_hex, 0)
+    def op_beq(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        if alu.is_branch_equal_to(registers[instruction.breg], registers[instruction.dstreg]):
+            self.cpu_state.pc = instruction.address // 4
 
+    def op_bne(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        if alu.is_branch_not_equal_to(registers[instruction.breg], registers[instruction.dstreg]):
+            self.cpu_state.pc = instruction.address // 4
+
+    def op_bez(self, instruction: Instruction):
+        if alu.is_branch_zero(self.cpu_state.registers[instruction.breg]):
+            self.cpu_state.pc = instruction.address // 4
+
+    def op_bnz(self, instruction: Instruction):
+        if alu.is_branch_not_zero(self.cpu_state.registers[instruction.breg]):
+            self.cpu_state.pc = instruction.address // 4
+
+    def op_bgz(self, instruction: Instruction):
+        if alu.is_branch_positive(self.cpu_state.registers[instruction.breg]):
+            self.cpu_state.pc = instruction.address // 4
+
+    def op_blz(self, instruction: Instruction):
+        if alu.is_branch_negative(self.cpu_state.registers[instruction.breg]):
+            self.cpu_state.pc = instruction.address // 4
+
+    # -- Unconditional Jump format -- #
+
+    def op_hlt(self, instruction: Instruction):
+        self.jobs_completed += 1
+        self.is_spinning = False
+        self.mmu.write_to_ram(self.current_pcb)
+        self.current_pcb.set_state(ENDED_STATE)
+
+    def op_jmp(self, instruction: Instruction):
+        self.cpu_state.pc = instruction.address
+
+    # -- Input and Output format -- #
+
+    def op_rd(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        if instruction.address == 0:
+            word_address = registers[instruction.reg2] // 4
+        else:
+            word_address = instruction.address // 4
+        self.logical_address.convert_from_raw_address(word_address)
+        self.handle_interrupt(self.logical_address)
+        if self.cpu_is_interrupted is True:
+            return
+        registers[instruction.reg1] = self.mmu.read_cache(self.logical_address, self.cache)
+
+    def op_wr(self, instruction: Instruction):
+        registers = self.cpu_state.registers
+        if instruction.reg1 == instruction.reg2:
+            word_address = instruction.address // 4
+        else:
+            word_address = registers[instruction.reg2] // 4
+        self.logical_address.convert_from_raw_address(word_address)
+        self.handle_interrupt(self.logical_address)
+        if self.cpu_is_interrupted is True:
+            return
+        self.mmu.write_cache(
+            logical_address=self.logical_address,
+            data=registers[instruction.reg1],
+            cache=self.cache
+        )
+
+    # ---------------------- #
+    # -- Reference Engine -- #
+    # ---------------------- #
+
+    def execute_reference(self, instruction: Instruction):
+        """     Reference engine, matches on format then opcode.     """
+        if instruction.format == 0x0:
+            self.execute_arithmetic(
+                opcode=instruction.opcode,
+                s1=instruction.reg1,
+                s2=instruction.reg2,
+                dr=instruction.address,
+            )
+        elif instruction.format == 0x1:
+            self.execute_conditional_branch(
+                opcode=instruction.opcode,
+                br=instruction.breg,
+                dr=instruction.dstreg,
+                address=instruction.address,
+            )
+        elif instruction.format == 0x2:
+            self.execute_unconditional_jump(
+                opcode=instruction.opcode,
+                address=instruction.address,
+            )
+        elif instruction.format == 0x3:
+            self.execute_io(
+                opcode=instruction.opcode,
+                r1=instruction.reg1,
+                r2=instruction.reg2,
+                address=instruction.address
+            )
+        else:
+            raise UnexpectedCPUError(
+                f'execute_reference(...) unable to match instruction->format {hex(instruction.format)}.'
+            )
+
+    def execute_io(self, opcode: int, r1: int, r2: int, address: int):
         # -- Check for Interrupts -- #
         if self.cpu_is_interrupted is True:
             return
 
         # Reads content of I/P buffer into an accumulator or a register #
-        if opcode_hex == '0x0':
-            if address_int == 0:
-                word_address = self.cpu_state.get_register(index=r2_int) // 4
+        if opcode == 0x0:
+            if address == 0:
+                word_address = self.cpu_state.get_register(index=r2) // 4
             else:
-                word_address = address_int // 4
+                word_address = address // 4
             self.logical_address.convert_from_raw_address(word_address)
 
             # -- Check for Interrupts -- #
@@ -155,15 +528,13 @@ class CPU:
                 return
 
             self.cpu_state.set_register(
-                index=r1_int,
-                value=int(
-                    self.mmu.read_cache(self.logical_address, self.cache),
-                    0),  # HEX TO INT
+                index=r1,
+                value=self.mmu.read_cache(self.logical_address, self.cache),
             )
 
         # Writes the content of accumulator into Output buffer #
-        elif opcode_hex == '0x1':
-            word_address = address_int // 4 if r1_hex == r2_hex else int(self.cpu_state.get_register(index=r2_int)) // 4
+        elif opcode == 0x1:
+            word_address = address // 4 if r1 == r2 else int(self.cpu_state.get_register(index=r2)) // 4
             self.logical_address.convert_from_raw_address(word_address)
 
             # -- Check for Interrupts -- #
@@ -173,18 +544,15 @@ class CPU:
 
             self.mmu.write_cache(
                 logical_address=self.logical_address,
-                data=int_to_hex_size_8(self.cpu_state.get_register(r1_int)),
+                data=self.cpu_state.get_register(r1),
                 cache=self.cache
             )
 
         # Custom Error #
         else:
-            raise UnexpectedCPUError(f'execute_io(...) unable to match opcode {opcode_hex}.')
-
-    def execute_unconditional_jump(self, opcode_hex: str, address_hex: str):
-        # -- Convert HEX to INT -- #
-        address_int = int(address_hex, 0)
+            raise UnexpectedCPUError(f'execute_io(...) unable to match opcode {hex(opcode)}.')
 
+    def execute_unconditional_jump(self, opcode: int, address: int):
         # -- Check for Interrupts -- #
         if self.cpu_is_interrupted is True:
             return
@@ -194,26 +562,21 @@ class CPU:
         # ------------------------ #
 
         # Logical end of program #
-        if opcode_hex == '0x12':
+        if opcode == 0x12:
             self.jobs_completed += 1
             self.is_spinning = False
             self.mmu.write_to_ram(self.current_pcb)
             self.current_pcb.set_state(ENDED_STATE)
 
         # Jumps to a specified location #
-        elif opcode_hex == '0x14':
-            self.cpu_state.set_pc(pc=address_int)
+        elif opcode == 0x14:
+            self.cpu_state.set_pc(pc=address)
 
         # Custom Error #
         else:
-            raise UnexpectedCPUError(f'execute_unconditional_jump(...) unable to match opcode {opcode_hex}.')
-
-    def execute_conditional_branch(self, opcode_hex: str, br_hex: str, dr_hex: str, address_hex: str):
-        # -- Convert HEX to INT -- #
-        br_int = int(br_hex, 0)
-        dr_int = int(dr_hex, 0)
-        address_int = int(address_hex, 0)
+            raise UnexpectedCPUError(f'execute_unconditional_jump(...) unable to match opcode {hex(opcode)}.')
 
+    def execute_conditional_branch(self, opcode: int, br: int, dr: int, address: int):
         # -- Check for Interrupts -- #
         if self.cpu_is_interrupted is True:
             return
@@ -223,8 +586,8 @@ class CPU:
         # ------------------------ #
 
         # Stores content of a reg. into an address #
-        if opcode_hex == '0x2':
-            word_address = self.cpu_state.get_register(index=dr_int) // 4
+        if opcode == 0x2:
+            word_address = self.cpu_state.get_register(index=dr) // 4
             self.logical_address.convert_from_raw_address(address=word_address)
 
             # -- Check for Interrupts -- #
@@ -234,12 +597,12 @@ class CPU:
 
             self.mmu.write_cache(
                 logical_address=self.logical_address,
-                data=int_to_hex_size_8(self.cpu_state.get_register(index=br_int)),
+                data=self.cpu_state.get_register(index=br),
                 cache=self.cache
             )
         # Loads the content of an address into a reg #
-        elif opcode_hex == '0x3':
-            word_address = self.cpu_state.get_register(index=br_int) // 4
+        elif opcode == 0x3:
+            word_address = self.cpu_state.get_register(index=br) // 4
             self.logical_address.convert_from_raw_address(address=word_address)
 
             # -- Check for Interrupts -- #
@@ -252,101 +615,96 @@ class CPU:
                 cache=self.cache
             )
         # Transfers address/data directly into a register #
-        elif opcode_hex == '0xb':
-            self.cpu_state.set_register(index=dr_int, value=address_int)
+        elif opcode == 0xb:
+            self.cpu_state.set_register(index=dr, value=address)
 
         # Adds a data value directly to the content of a register #
-        elif opcode_hex == '0xc':
+        elif opcode == 0xc:
             acc = alu.add(
-                r1=self.cpu_state.get_register(index=dr_int),
-                r2=address_int
+                r1=self.cpu_state.get_register(index=dr),
+                r2=address
             )
-            self.cpu_state.set_register(index=dr_int, value=acc)
+            self.cpu_state.set_register(index=dr, value=acc)
 
         # Multiplies a data value directly with the content of a register #
-        elif opcode_hex == '0xd':
+        elif opcode == 0xd:
             acc = alu.multi(
-                r1=self.cpu_state.get_register(index=dr_int),
-                r2=address_int
+                r1=self.cpu_state.get_register(index=dr),
+                r2=address
             )
-            self.cpu_state.set_register(index=dr_int, value=acc)
+            self.cpu_state.set_register(index=dr, value=acc)
 
         # Divides a data directly into the content of a register #
-        elif opcode_hex == '0xe':
+        elif opcode == 0xe:
             acc = alu.div(
-                r1=self.cpu_state.get_register(index=dr_int),
-                r2=address_int
+                r1=self.cpu_state.get_register(index=dr),
+                r2=address
             )
-            self.cpu_state.set_register(index=dr_int, value=acc)
+            self.cpu_state.set_register(index=dr, value=acc)
 
         # Loads a data/address directly to the content of a register #
-        elif opcode_hex == '0xf':
-            self.cpu_state.set_register(index=dr_int, value=address_int)
+        elif opcode == 0xf:
+            self.cpu_state.set_register(index=dr, value=address)
 
         # Sets the D-reg to 1 if first S-reg is less than a data; 0 otherwise #
-        elif opcode_hex == '0x11':
+        elif opcode == 0x11:
             if alu.less_than(
-                    r1=self.cpu_state.get_register(index=br_int),
-                    r2=address_int
+                    r1=self.cpu_state.get_register(index=br),
+                    r2=address
             ):
-                self.cpu_state.set_register(index=dr_int, value=1)
+                self.cpu_state.set_register(index=dr, value=1)
             else:
-                self.cpu_state.set_register(index=dr_int, value=0)
+                self.cpu_state.set_register(index=dr, value=0)
 
         # Branches to an address when content of B-reg = D-reg #
-        elif opcode_hex == '0x15':
+        elif opcode == 0x15:
             if alu.is_branch_equal_to(
-                    breg=self.cpu_state.get_register(index=br_int),
-                    dreg=self.cpu_state.get_register(index=dr_int)
+                    breg=self.cpu_state.get_register(index=br),
+                    dreg=self.cpu_state.get_register(index=dr)
             ):
-                self.cpu_state.set_pc(pc=address_int//4)
+                self.cpu_state.set_pc(pc=address//4)
 
         # Branches to an address when content of B-reg <> D-reg #
-        elif opcode_hex == '0x16':
+        elif opcode == 0x16:
             if alu.is_branch_not_equal_to(
-                    breg=self.cpu_state.get_register(index=br_int),
-                    dreg=self.cpu_state.get_register(index=dr_int)
+                    breg=self.cpu_state.get_register(index=br),
+                    dreg=self.cpu_state.get_register(index=dr)
             ):
-                self.cpu_state.set_pc(pc=address_int//4)
+                self.cpu_state.set_pc(pc=address//4)
 
         # Branches to an address when content of B-reg = 0 #
-        elif opcode_hex == '0x17':
+        elif opcode == 0x17:
             if alu.is_branch_zero(
-                    breg=self.cpu_state.get_register(index=br_int),
+                    breg=self.cpu_state.get_register(index=br),
             ):
-                self.cpu_state.set_pc(pc=address_int//4)
+                self.cpu_state.set_pc(pc=address//4)
 
         # Branches to an address when content of B-reg <> 0 #
-        elif opcode_hex == '0x18':
+        elif opcode == 0x18:
             if alu.is_branch_not_zero(
-                    breg=self.cpu_state.get_register(index=br_int),
+                    breg=self.cpu_state.get_register(index=br),
             ):
-                self.cpu_state.set_pc(pc=address_int//4)
+                self.cpu_state.set_pc(pc=address//4)
 
         # Branches to an address when content of B-reg > 0 #
-        elif opcode_hex == '0x19':
+        elif opcode == 0x19:
             if alu.is_branch_positive(
-                    breg=self.cpu_state.get_register(index=br_int),
+                    breg=self.cpu_state.get_register(index=br),
             ):
-                self.cpu_state.set_pc(pc=address_int//4)
+                self.cpu_state.set_pc(pc=address//4)
 
         # Branches to an address when content of B-reg < 0 #
-        elif opcode_hex == '0x1a':
+        elif opcode == 0x1a:
             if alu.is_branch_negative(
-                    breg=self.cpu_state.get_register(index=br_int),
+                    breg=self.cpu_state.get_register(index=br),
             ):
-                self.cpu_state.set_pc(pc=address_int//4)
+                self.cpu_state.set_pc(pc=address//4)
 
         # Custom Error #
         else:
-            raise UnexpectedCPUError(f'execute_conditional_branch(...) unable to match opcode {opcode_hex}.')
-
-    def execute_arithmetic(self, opcode_hex: str, s1_hex: str, s2_hex: str, dr_hex: str):
-        # -- Convert HEX to INT -- #
-        s1_int = int(s1_hex, 0)
-        s2_int = int(s2_hex, 0)
-        dr_int = int(dr_hex, 0)
+            raise UnexpectedCPUError(f'execute_conditional_branch(...) unable to match opcode {hex(opcode)}.')
 
+    def execute_arithmetic(self, opcode: int, s1: int, s2: int, dr: int):
         # -- Check for Interrupts -- #
         if self.cpu_is_interrupted is True:
             return
@@ -356,86 +714,75 @@ class CPU:
         # ------------------------ #
 
         # Transfers the content of one register into another #
-        if opcode_hex == '0x4':
+        if opcode == 0x4:
             self.cpu_state.set_register(
-                index=s1_int,
-                value=self.cpu_state.get_register(s2_int)
+                index=s1,
+                value=self.cpu_state.get_register(s2)
             )
 
         # Adds content of two S-regs into D-reg #
-        elif opcode_hex == '0x5':
+        elif opcode == 0x5:
             acc = alu.add(
-                r1=self.cpu_state.get_register(s1_int),
-                r2=self.cpu_state.get_register(s2_int)
+                r1=self.cpu_state.get_register(s1),
+                r2=self.cpu_state.get_register(s2)
             )
-            self.cpu_state.set_register(dr_int, acc)
+            self.cpu_state.set_register(dr, acc)
 
         # Subtracts content of two S-regs into D-reg #
-        elif opcode_hex == '0x6':
+        elif opcode == 0x6:
             acc = alu.sub(
-                r1=self.cpu_state.get_register(s1_int),
-                r2=self.cpu_state.get_register(s2_int)
+                r1=self.cpu_state.get_register(s1),
+                r2=self.cpu_state.get_register(s2)
             )
-            self.cpu_state.set_register(dr_int, acc)
+            self.cpu_state.set_register(dr, acc)
 
         # Multiplies content of two S-regs into D-reg #
-        elif opcode_hex == '0x7':
+        elif opcode == 0x7:
             acc = alu.multi(
-                r1=self.cpu_state.get_register(s1_int),
-                r2=self.cpu_state.get_register(s2_int)
+                r1=self.cpu_state.get_register(s1),
+                r2=self.cpu_state.get_register(s2)
             )
-            self.cpu_state.set_register(dr_int, acc)
+            self.cpu_state.set_register(dr, acc)
 
         # Divides content of two S-regs into D-reg #
-        elif opcode_hex == '0x8':
+        elif opcode == 0x8:
             acc = alu.div(
-                r1=self.cpu_state.get_register(s1_int),
-                r2=self.cpu_state.get_register(s2_int)
+                r1=self.cpu_state.get_register(s1),
+                r2=self.cpu_state.get_register(s2)
             )
-            self.cpu_state.set_register(dr_int, acc)
+            self.cpu_state.set_register(dr, acc)
 
         # Logical AND of two S-regs into D-reg #
-        elif opcode_hex == '0x9':
+        elif opcode == 0x9:
             acc = alu.and_operator(
-                r1=self.cpu_state.get_register(s1_int),
-                r2=self.cpu_state.get_register(s2_int)
+                r1=self.cpu_state.get_register(s1),
+                r2=self.cpu_state.get_register(s2)
             )
-            self.cpu_state.set_register(dr_int, acc)
+            self.cpu_state.set_register(dr, acc)
 
         # Logical OR of two S-regs into D-reg #
-        elif opcode_hex == '0xa':
+        elif opcode == 0xa:
             acc = alu.or_operator(
-                r1=self.cpu_state.get_register(s1_int),
-                r2=self.cpu_state.get_register(s2_int)
+                r1=self.cpu_state.get_register(s1),
+                r2=self.cpu_state.get_register(s2)
             )
-            self.cpu_state.set_register(dr_int, acc)
+            self.cpu_state.set_register(dr, acc)
 
         # Sets the D-reg to 1 if first S-reg is less than the B-reg; 0 otherwise #
-        elif opcode_hex == '0x10':
+        elif opcode == 0x10:
             if alu.less_than(
-                    r1=self.cpu_state.get_register(s1_int),
-                    r2=self.cpu_state.get_register(s2_int)
+                    r1=self.cpu_state.get_register(s1),
+                    r2=self.cpu_state.get_register(s2)
             ):
-                self.cpu_state.set_register(dr_int, 1)
+                self.cpu_state.set_register(dr, 1)
             else:
-                self.cpu_state.set_register(dr_int, 0)
+                self.cpu_state.set_register(dr, 0)
 
         # Custom Error #
         else:
-            raise UnexpectedCPUError(f'execute_arithmetic(...) unable to match opcode {opcode_hex}.')
+            raise UnexpectedCPUError(f'execute_arithmetic(...) unable to match opcode {hex(opcode)}.')
 
 
 class UnexpectedCPUError(Exception):
     pass
 
-
-def int_to_hex_size_8(x: int) -> str:
-    """
-    Takes and int() and converts to a HEX, prepending
-    0's where needed to reach size of 8 digits.
-    """
-    x_hex = hex(x).replace('0x', '')
-    while len(x_hex) < 8:
-        x_hex = "0" + x_hex
-    x_hex = '0x' + x_hex
-    return x_hex
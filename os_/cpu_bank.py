@@ -0,0 +1,327 @@
+"""
+    The CPU bank builds the CPUs a ShortScheduler dispatches to.
+
+    With CPU_BANK = 'Threaded' every CPU executes in a thread of the
+    simulator. With CPU_BANK = 'Process' every CPU is a ProcessCPU,
+    a proxy whose thread hands the dispatched job over a pipe to a
+    worker process that runs the same CPU code on its own host core.
+
+    A CPU only ever touches the cpu_state and cache of the PCB it
+    runs, so a worker never needs the PCB, the simulator's RAM,
+    kernel queues or daemons. The proxy copies the valid cache pages
+    into SharedPages, shared memory the worker runs on in place, and
+    only pickles the pc, registers and cache bits. Dirty pages are
+    copied back once the worker returns. When the worker stops on a page
+    fault / IO interrupt, on HLT or at the end of its time slice the
+    proxy replays that stop through the real MMU, which queues the
+    request and changes state exactly as the threaded CPU would.
+
+    Translated blocks live in the worker. The proxy's ProxyTranslator
+    only collects the jobs the PageManager invalidates, the worker
+    drops their blocks before it runs the next PCB.
+"""
+import multiprocessing
+from array import array
+from collections import deque
+from multiprocessing import shared_memory
+from os_.mmu import MMU
+from os_.cpu import CPU
+from os_.cache import Cache
+from os_.cpu_state import CPUState
+from os_.page import Page
+from os_.logical_address import LogicalAddress
+from os_.pcb import PCB
+from os_.translator import BlockTranslator
+from os_.config import CPU_BANK, READY_STATE, RUNNING_STATE, ENDED_STATE, PAGE_SIZE
+from os_.sync_print import sync_print
+
+CPU_BANK_DEBUG = False
+
+
+def create_cpu(id_: int, mmu: MMU) -> CPU:
+    if CPU_BANK == 'Threaded':
+        return CPU(id_=id_, mmu=mmu)
+    elif CPU_BANK == 'Process':
+        return ProcessCPU(id_=id_, mmu=mmu)
+    raise UnexpectedCPUBankError(f'Unsupported CPU_BANK {CPU_BANK}.')
+
+
+class ProcessCPU(CPU):
+
+    # -- spawn, the simulator is already running daemon threads -- #
+    CONTEXT = multiprocessing.get_context('spawn')
+
+    def __init__(self, id_: int, mmu: MMU):
+        super().__init__(id_=id_, mmu=mmu)
+        if self.translator is not None:
+            self.translator = ProxyTranslator()
+            if mmu.kernel is not None:
+                mmu.kernel.register_translator(id_, self.translator)
+        # -- Grown, and handed to the worker again, when a job has more pages -- #
+        self.shared = None
+        self.connection, worker_connection = self.CONTEXT.Pipe()
+        self.worker = self.CONTEXT.Process(
+            target=cpu_worker,
+            args=(worker_connection, id_),
+            name=f'CPU-{id_}',
+            daemon=True,
+        )
+        self.worker.start()
+        worker_connection.close()
+
+    def end_cpu(self):
+        super().end_cpu()
+        if self.worker.is_alive() is True:
+            self.connection.send(None)
+            self.worker.join()
+        if self.shared is not None:
+            self.shared.close(unlink=True)
+            self.shared = None
+
+    def run_process(self):
+        """     Runs current_pcb on the worker until it is interrupted or halts.     """
+        pcb = self.current_pcb
+        cache = self.cache
+        invalidated = list()
+        if self.translator is not None:
+            while self.translator.invalidated:
+                invalidated.append(self.translator.invalidated.popleft())
+        shared_name = None
+        if self.shared is None or len(self.shared) < len(cache):
+            if self.shared is not None:
+                self.shared.close(unlink=True)
+            self.shared = SharedPages(page_count=len(cache))
+            shared_name = self.shared.get_name()
+        pages = self.shared.pages
+        for i in range(len(cache)):
+            if cache.valid[i] is True:
+                pages[i].copy_from(cache.cache[i])
+        self.connection.send((
+            shared_name,
+            len(self.shared),
+            pcb.job_id,
+            self.cpu_state.pc,
+            self.cpu_state.registers,
+            cache.valid,
+            cache.dirty,
+            cache.written,
+            [page.used for page in cache.cache],
+            invalidated,
+        ))
+        result = self.connection.recv()
+        if isinstance(result, Exception):
+            raise result
+        pc, registers, valid, dirty, written, used, state, interrupt, counters = result
+        sync_print(
+            f'DEBUG: [ProcessCPU {self.cpu_id}] PID {pcb.job_id} stopped at pc {pc}.'
+        ) if CPU_BANK_DEBUG is True else None
+
+        self.cpu_state.pc = pc
+        self.cpu_state.registers[:] = registers
+        cache.valid[:] = valid
+        cache.dirty[:] = dirty
+        cache.written[:] = written
+        for i in range(len(cache)):
+            if dirty[i] is True:
+                pages[i].used = used[i]
+                cache.cache[i].copy_from(pages[i])
+        self.set_counters(counters)
+
+        if state == ENDED_STATE:
+            self.mmu.write_to_ram(pcb)
+            pcb.set_state(ENDED_STATE)
+        elif state == READY_STATE:
+            self.mmu.preempt(pcb)
+        elif interrupt is not None:
+            # -- The worker counted the miss, only the MMU is replayed -- #
+            self.logical_address.convert_from_raw_address(interrupt * PAGE_SIZE)
+            self.mmu.check_for_interrupt(self.logical_address, self.cache, pcb)
+
+    def set_counters(self, counters: tuple):
+        (
+            self.jobs_completed,
+            self.instructions_executed,
+            self.fetches,
+            self.interrupt_checks_avoided,
+            self.preemptions,
+            self.cache_hits,
+            self.cache_misses,
+            self.interrupts,
+            self.format_counts,
+            translator,
+        ) = counters
+        if self.translator is not None:
+            (
+                self.translator.blocks_translated,
+                self.translator.blocks_executed,
+                self.translator.fallbacks,
+            ) = translator
+
+
+class SharedPages:
+
+    """     PAGE_SIZE words per page in shared memory, created by the proxy and attached by name in the worker.     """
+
+    __slots__ = ['memory', 'words', 'pages']
+
+    WORD_BYTES = array('I').itemsize
+
+    def __init__(self, page_count: int, name: str = None):
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=page_count * PAGE_SIZE * self.WORD_BYTES)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.words = self.memory.buf.cast('I')
+        # -- Windows into words, like the pages of RAM / Disk -- #
+        self.pages = [Page(words=self.words, base=i * PAGE_SIZE) for i in range(page_count)]
+
+    def __len__(self):
+        return self.pages.__len__()
+
+    def get_name(self) -> str:
+        return self.memory.name
+
+    def close(self, unlink: bool):
+        self.pages = list()
+        self.words.release()
+        self.memory.close()
+        if unlink is True:
+            self.memory.unlink()
+
+
+class WorkerPCB:
+
+    """     The part of a PCB a worker's CPU touches.     """
+
+    __slots__ = ['job_id', 'state', 'cpu_state']
+
+    def __init__(self):
+        self.job_id = None
+        self.state = None
+        self.cpu_state = CPUState()
+
+    def get_cpu_state(self) -> CPUState:
+        return self.cpu_state
+
+    def get_state(self) -> str:
+        return self.state
+
+    def set_state(self, state: str):
+        self.state = state
+
+
+class ProxyTranslator(BlockTranslator):
+
+    """     Counters of the worker's BlockTranslator, and the jobs to invalidate there.     """
+
+    __slots__ = ['invalidated']
+
+    def __init__(self):
+        super().__init__()
+        self.invalidated = deque()
+
+    def invalidate(self, job_id: str):
+        self.invalidated.append(job_id)
+
+
+class WorkerMMU(MMU):
+
+    """
+        MMU of a worker process. It only checks the cache and
+        records the page the CPU stopped on, the interrupt itself
+        is raised by the ProcessCPU through the real MMU.
+    """
+
+    __slots__ = ['interrupt']
+
+    def __init__(self):
+        super().__init__(kernel=None, ram=None)
+        self.interrupt = None
+
+    def check_for_interrupt(self, logical_address: LogicalAddress, cache: Cache, pcb: PCB) -> bool:
+        if cache.is_page_valid(logical_address=logical_address) is True:
+            return False
+        self.interrupt = logical_address.get_page_number()
+        return True
+
+    def preempt(self, pcb: PCB):
+        """     Replayed by the ProcessCPU, which requeues pcb.     """
+        pcb.set_state(READY_STATE)
+
+    def write_to_ram(self, pcb: PCB):
+        """     Replayed by the ProcessCPU once the worker returns.     """
+        pass
+
+
+def cpu_worker(connection, cpu_id: int):
+    """     Body of a worker process, runs one job per message until None.     """
+    mmu = WorkerMMU()
+    cpu = CPU(id_=cpu_id, mmu=mmu)
+    pcb = WorkerPCB()
+    cpu_state = pcb.get_cpu_state()
+    cache = cpu_state.get_cache()
+    shared = None
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        shared_name, page_count, job_id, pc, registers, valid, dirty, written, used, invalidated = message
+        for ended_job_id in invalidated:
+            cpu.translator.invalidate(ended_job_id)
+        try:
+            if shared_name is not None:
+                if shared is not None:
+                    shared.close(unlink=False)
+                shared = SharedPages(page_count=page_count, name=shared_name)
+            pages = shared.pages[:len(valid)]
+            for page, n in zip(pages, used):
+                page.used = n
+            cache.cache = pages
+            cache.valid = valid
+            cache.dirty = dirty
+            cache.written = written
+            cpu_state.pc = pc
+            cpu_state.registers = registers
+            pcb.job_id = job_id
+            pcb.state = RUNNING_STATE
+            mmu.interrupt = None
+            cpu.current_pcb = pcb
+            cpu.initialize_cpu()
+            cpu.run_process()
+            translator = cpu.translator
+            connection.send((
+                cpu_state.pc,
+                cpu_state.registers,
+                cache.valid,
+                cache.dirty,
+                cache.written,
+                [page.used for page in pages],
+                pcb.get_state(),
+                mmu.interrupt,
+                (
+                    cpu.jobs_completed,
+                    cpu.instructions_executed,
+                    cpu.fetches,
+                    cpu.interrupt_checks_avoided,
+                    cpu.preemptions,
+                    cpu.cache_hits,
+                    cpu.cache_misses,
+                    cpu.interrupts,
+                    cpu.format_counts,
+                    None if translator is None else (
+                        translator.blocks_translated,
+                        translator.blocks_executed,
+                        translator.fallbacks,
+                    ),
+                ),
+            ))
+        except Exception as error:
+            connection.send(error)
+    cache.cache = list()
+    if shared is not None:
+        shared.close(unlink=False)
+    connection.close()
+
+
+class UnexpectedCPUBankError(Exception):
+    pass
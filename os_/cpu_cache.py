@@ -0,0 +1,164 @@
+"""
+    Set-associative cache of a CPU, used when CPU_CACHE_LINES > 0.
+
+    The words of a job's pages stay in the job's own Cache, carried by
+    its CPUState, a CPUCache decides which of those pages are resident.
+    It has CPU_CACHE_LINES lines of one page, in sets of CPU_CACHE_WAYS
+    lines, and page_num of a job maps to set (job id + page_num) % sets.
+    Filling a full set evicts the line CPU_CACHE_REPLACEMENT picks, LRU,
+    FIFO or Random. The page is invalidated in its job's Cache and, when
+    dirty, written back to its RAM frame, which marks the frame dirty in
+    the job's PageTable.
+
+    Lines of the job the CPU runs are never evicted, the CPU reads and
+    writes those without a lock, nor the page of the instruction the job
+    being filled stopped on, so its next try finds both pages it needs.
+    A set without any other line grows by one line until its next fill.
+
+    A job dispatched to another CPU has its lines written back and
+    dropped here when it is attached there.
+
+    Lines are referenced when the DMA channel fills them and when the
+    MMU looks a page up, not on every word the CPU reads.
+"""
+import random
+import threading
+from collections import OrderedDict
+from os_.pcb import PCB
+from os_.config import PAGE_SIZE
+from os_.sync_print import sync_print
+
+CPU_CACHE_DEBUG = False
+
+
+class CPUCache:
+
+    __slots__ = [
+        'cpu_id', 'ram', 'replacement', 'set_count', 'ways', 'sets', 'random',
+        'running', 'lock',
+        'fills', 'evictions', 'write_backs', 'overflows',
+    ]
+
+    REPLACEMENTS = ['LRU', 'FIFO', 'Random']
+
+    def __init__(self, cpu_id: int, ram, lines: int, ways: int, replacement: str):
+        if replacement not in self.REPLACEMENTS:
+            raise UnexpectedCPUCacheError(f'Unsupported CPU_CACHE_REPLACEMENT {replacement}.')
+        if ways < 1 or lines % ways != 0:
+            raise UnexpectedCPUCacheError(f'CPU_CACHE_LINES {lines} is not a multiple of CPU_CACHE_WAYS {ways}.')
+        self.cpu_id = cpu_id
+        self.ram = ram
+        self.replacement = replacement
+        self.set_count = lines // ways
+        self.ways = ways
+        # -- (PCB, page_num) -> None per set, least recently used / first filled first -- #
+        self.sets = [OrderedDict() for i in range(self.set_count)]
+        # -- Seeded, the event driver gives the same dumps every run -- #
+        self.random = random.Random(cpu_id)
+        self.running = None
+        self.lock = threading.Lock()
+
+        # -- Metrics -- #
+        self.fills = 0
+        self.evictions = 0
+        self.write_backs = 0
+        self.overflows = 0
+
+    def get_set(self, pcb: PCB, page_num: int) -> OrderedDict:
+        return self.sets[(int(pcb.job_id, 16) + page_num) % self.set_count]
+
+    def attach(self, pcb: PCB, cpu_caches: dict):
+        """     The CPU is about to run pcb, its lines move here from the CPU it last ran on.     """
+        previous = cpu_caches.get(pcb.cache_cpu_id)
+        if previous is not None and previous is not self:
+            previous.release(pcb)
+        with self.lock:
+            self.running = pcb
+        pcb.cache_cpu_id = self.cpu_id
+
+    def detach(self):
+        with self.lock:
+            self.running = None
+
+    def fill(self, pcb: PCB, page_num: int):
+        """     The DMA channel copied page_num of pcb into its Cache.     """
+        with self.lock:
+            cache_set = self.get_set(pcb, page_num)
+            line = (pcb, page_num)
+            if line in cache_set:
+                cache_set.move_to_end(line)
+                return
+            pinned = (line, (pcb, pcb.cpu_state.get_pc() // PAGE_SIZE))
+            while len(cache_set) >= self.ways:
+                victim = self.select_victim(cache_set, pinned)
+                if victim is None:
+                    self.overflows += 1
+                    break
+                self.evict(cache_set, victim)
+            cache_set[line] = None
+            self.fills += 1
+
+    def reference(self, pcb: PCB, page_num: int):
+        if self.replacement != 'LRU':
+            return
+        with self.lock:
+            cache_set = self.get_set(pcb, page_num)
+            if (pcb, page_num) in cache_set:
+                cache_set.move_to_end((pcb, page_num))
+
+    def select_victim(self, cache_set: OrderedDict, pinned: tuple) -> tuple:
+        candidates = [victim for victim in cache_set if victim[0] is not self.running and victim not in pinned]
+        if not candidates:
+            return None
+        if self.replacement == 'Random':
+            return self.random.choice(candidates)
+        return candidates[0]
+
+    def evict(self, cache_set: OrderedDict, line: tuple):
+        del cache_set[line]
+        pcb, page_num = line
+        self.write_back(pcb, page_num)
+        pcb.cache_evictions += 1
+        self.evictions += 1
+        sync_print(
+            f'DEBUG: [CPUCache {self.cpu_id}] Evicted page {page_num} of PID {pcb.job_id}.'
+        ) if CPU_CACHE_DEBUG is True else None
+
+    def write_back(self, pcb: PCB, page_num: int) -> bool:
+        """     Invalidates page_num in the Cache of pcb, writing it to its frame when dirty.     """
+        cache = pcb.cpu_state.get_cache()
+        written = cache.is_page_modified(index=page_num) is True and cache.is_page_valid(index=page_num) is True
+        if written is True:
+            page_table = pcb.get_page_table()
+            frame = page_table.get_page(page_num=page_num)
+            # -- Copy-on-write, a page deduplicated with another job may go to Disk -- #
+            if self.ram.page_manager.write_page(pcb, page_num, frame, cache.read_page(page_num=page_num)) is True:
+                page_table.set_dirty(page_num)
+            self.write_backs += 1
+        cache.set_valid_page(page_num, False)
+        cache.set_dirty_page(page_num, False)
+        return written
+
+    def release(self, pcb: PCB) -> int:
+        """     Writes back and drops every line of pcb, returns the pages written.     """
+        written = 0
+        with self.lock:
+            for cache_set in self.sets:
+                for line in [line for line in cache_set if line[0] is pcb]:
+                    del cache_set[line]
+                    written += self.write_back(*line)
+            if self.running is pcb:
+                self.running = None
+        return written
+
+    def invalidate(self, pcb: PCB, page_num: int):
+        """     Drops the line of a page whose frame is evicted, its data is left to the Page Manager.     """
+        with self.lock:
+            self.get_set(pcb, page_num).pop((pcb, page_num), None)
+
+    def get_occupancy(self) -> int:
+        return sum(len(cache_set) for cache_set in self.sets)
+
+
+class UnexpectedCPUCacheError(Exception):
+    pass
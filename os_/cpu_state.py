@@ -1,6 +1,7 @@
 from os_.instruction import Instruction
 from os_.cache import Cache
 from os_.synchronization import synchronized
+from os_.config import DECODE_CACHE
 
 
 class CPUState:
@@ -43,8 +44,8 @@ class CPUState:
     def get_instruction(self) -> Instruction:
         return self.instruction
 
-    def set_instruction(self, instruction_bin: str):
-        self.instruction.decode_instruction(instruction_bin)
+    def set_instruction(self, word: int):
+        self.instruction = DECODE_CACHE.decode(word)
 
     def get_register(self, index: int) -> int:
         return self.registers[index]
@@ -58,3 +59,6 @@ class CPUState:
 
     def get_cache(self) -> Cache:
         return self.cache
+
+    def set_cache(self, cache: Cache):
+        self.cache = cache
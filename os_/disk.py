@@ -1,51 +1,175 @@
+import mmap
+import os
+import struct
+from array import array
 from os_.page import Page
 from os_.synchronization import synchronized
-from os_.config import PAGE_SIZE
+from os_.config import PAGE_SIZE, WORD_MASK
 
 
 class Disk:
 
     __slots__ = [
-        'disk',
+        'words',
+        'used',
+        'capacity',
+        'path',
+        'file',
+        'map',
         'jobs_on_disk',
         'next_free_page',
+        '__weakref__',
     ]
 
     DEFAULT_CAPACITY = 2 ** 11 // PAGE_SIZE  # 2048 words
 
     """
-        Since in our implementation a page is tied 
+        Since in our implementation a page is tied
         to a job, then we needed more pages to accommodate
         for the 'blank page slots' not used.
     """
 
     DEFAULT_CAPACITY += 400 // PAGE_SIZE  # words
 
-    def __init__(self, capacity: int = DEFAULT_CAPACITY):
-        self.disk: list = [
-            Page()
-            for i in range(capacity)
-        ]
+    """
+        A Disk given a path is backed by a memory-mapped file,
+        so only the pages touched cost (page cache) memory.
+        Layout: HEADER, one used count byte per page padded
+        to 4 bytes, then the packed 32-bit words of all pages.
+        An existing file with a matching header is reopened
+        with its pages, any other file is recreated empty.
+    """
+
+    HEADER = struct.Struct('<4sHHII')  # magic, version, PAGE_SIZE, capacity, next free page
+    MAGIC = b'AZDK'
+    VERSION = 1
+
+    def __init__(self, capacity: int = None, path: str = None):
+        self.capacity = capacity if capacity is not None else self.DEFAULT_CAPACITY
+        self.path = path
+        self.file = None
+        self.map = None
         self.next_free_page = 0
+        if path is None:
+            # -- One flat buffer of 32-bit words, pages are windows into it -- #
+            self.words = array('I', bytes(self.capacity * PAGE_SIZE * 4))
+            self.used = bytearray(self.capacity)
+        else:
+            self.open_disk_file()
 
     def __len__(self):
         """ Number of pages on disk"""
-        return self.disk.__len__()
+        return self.capacity
+
+    def open_disk_file(self):
+        used_size = self.capacity + (-self.capacity % 4)
+        size = self.HEADER.size + used_size + self.capacity * PAGE_SIZE * 4
+        is_new = os.path.exists(self.path) is False or os.path.getsize(self.path) != size
+        if is_new is False:
+            with open(self.path, 'rb') as fh:
+                magic, version, page_size, capacity, next_free_page = self.HEADER.unpack(
+                    fh.read(self.HEADER.size)
+                )
+            is_new = (magic, version, page_size, capacity) != (self.MAGIC, self.VERSION, PAGE_SIZE, self.capacity)
+        self.file = open(self.path, 'r+b' if is_new is False else 'w+b')
+        if is_new is True:
+            # -- Sparse, pages are only allocated once they are written -- #
+            self.file.truncate(size)
+            next_free_page = 0
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.next_free_page = next_free_page
+        self.write_header()
+        view = memoryview(self.map)
+        self.used = view[self.HEADER.size:self.HEADER.size + self.capacity]
+        self.words = view[self.HEADER.size + used_size:].cast('I')
+
+    def write_header(self):
+        if self.map is not None:
+            self.HEADER.pack_into(
+                self.map, 0, self.MAGIC, self.VERSION, PAGE_SIZE, self.capacity, self.next_free_page
+            )
+
+    def close(self):
+        if self.map is not None:
+            self.words.release()
+            self.used.release()
+            self.map.close()
+            self.file.close()
+            self.map = None
 
     @synchronized
-    def write_disk(self, page_num: int, index: int, instruction: str):
-        self.disk[page_num].write_page(index, instruction)
-        if self.disk[page_num].is_full():
+    def write_disk(self, page_num: int, index: int, instruction: int):
+        self.words[page_num * PAGE_SIZE + index] = instruction & WORD_MASK
+        if index >= self.used[page_num]:
+            self.used[page_num] = index + 1
+        if self.used[page_num] == PAGE_SIZE:
             self.increment_next_free_page()
 
+    @synchronized
+    def write_page(self, page_num: int, page: Page):
+        """     Writes a whole page back in one slice, keeps the larger used count.     """
+        base = page_num * PAGE_SIZE
+        memoryview(self.words)[base:base + PAGE_SIZE] = page.get_words()
+        if page.used > self.used[page_num]:
+            self.used[page_num] = page.used
+
+    @synchronized
+    def copy_page(self, source: int, target: int):
+        """     Copies the words and used count of page source over page target.     """
+        if source == target:
+            return
+        memoryview(self.words)[target * PAGE_SIZE:(target + 1) * PAGE_SIZE] = \
+            self.words[source * PAGE_SIZE:(source + 1) * PAGE_SIZE]
+        self.used[target] = self.used[source]
+
+    @synchronized
+    def truncate(self, page_count: int):
+        """     Clears the pages from page_count on that were written, page_count is the next free page.     """
+        words = slice(page_count * PAGE_SIZE, self.next_free_page * PAGE_SIZE)
+        self.words[words] = array('I', bytes((words.stop - words.start) * 4))
+        self.used[page_count:self.next_free_page] = bytes(self.next_free_page - page_count)
+        self.next_free_page = page_count
+        self.write_header()
+
     @synchronized
     def read_disk(self, page_num: int) -> Page:
-        return self.disk[page_num]
+        return DiskPage(disk=self, page_num=page_num)
 
     @synchronized
     def get_next_free_page(self) -> int:
         return self.next_free_page
 
+    @synchronized
+    def set_next_free_page(self, page_num: int):
+        self.next_free_page = page_num
+        self.write_header()
+
     @synchronized
     def increment_next_free_page(self):
         self.next_free_page += 1
+        self.write_header()
+
+
+class DiskPage(Page):
+
+    """
+        Window onto one page of a Disk, no words are copied.
+        Its used count lives in the Disk, so it is shared by
+        every window onto the same page.
+    """
+
+    __slots__ = ['page_num', 'used_counts']
+
+    def __init__(self, disk: Disk, page_num: int):
+        self.words = disk.words
+        self.base = page_num * PAGE_SIZE
+        self.page_num = page_num
+        self.used_counts = disk.used
+
+    @property
+    def used(self) -> int:
+        return self.used_counts[self.page_num]
+
+    @used.setter
+    def used(self, used: int):
+        self.used_counts[self.page_num] = used
@@ -1,7 +1,8 @@
 from os_.ram import RAM
 from os_.kernel import Kernel
-from os_.logical_address import LogicalAddress
-from os_.config import PAGE_SIZE
+from os_.pcb import PCB
+from os_.config import PERF_COUNTERS, statistics
+from os_.perf_counters import get_counters, now
 from os_.synchronization import synchronized
 from os_.sync_print import sync_print
 
@@ -10,44 +11,99 @@ DMAChannelDEBUG = False
 
 class DMAChannel:
 
-    __slots__ = ['ram', 'kernel', '__is_running']
+    """
+        One DMA channel. Every channel claims whole requests from
+        Kernel.io_queue, so DMA_CHANNELS channels serve that many
+        requests at once, and copies each requested page from RAM into
+        the PCB's cache in one slice.
+    """
 
-    def __init__(self, ram: RAM, kernel: Kernel):
+    __slots__ = [
+        'channel_id', 'ram', 'kernel', '__is_running',
+        'requests', 'pages', 'busy_time', 'queue_wait', 'max_queue_wait',
+        '__weakref__',
+    ]
+
+    def __init__(self, ram: RAM, kernel: Kernel, channel_id: int = 1):
+        self.channel_id = channel_id
         self.ram = ram
         self.kernel = kernel
         self.__is_running = True
 
+        # -- Metrics, on the statistics clock -- #
+        self.requests = 0
+        self.pages = 0
+        self.busy_time = 0.0
+        self.queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
     def start_daemon(self):
         while self.__is_running:
-            if self.kernel.has_io_jobs():
-                sync_print(
-                    'DEBUG: [DMAChannel] Activated!'
-                ) if DMAChannelDEBUG is True else None
-                pcb = self.kernel.get_job_from_io_queue()
-                logical_address = LogicalAddress()
-                cached = self.kernel.get_pages_from_io_queue(pcb)
-                for page_num in cached:
-                    pcb.io_operations += 1
-                    logical_address.set_page_number(page_num)
-                    # -- get page table -- #
-                    page_table = pcb.get_page_table()
-                    # -- find page in ram -- #
-                    ram_address = page_table.get_page(page_num)
-                    # -- copy ram --> cache -- #
-                    pcb_cache = pcb.cpu_state.get_cache()
-                    for page_offset in range(PAGE_SIZE):
-                        logical_address.set_page_offset(page_offset)
-                        data = self.ram.read_ram(ram_address, page_address=page_offset)
-                        pcb_cache.write_cache(logical_address, data)
-                    # -- set valid/dirty bits -- #
-                    pcb_cache.set_valid_page(page_num, True)
-                    pcb_cache.set_dirty_page(page_num, False)
-                # -- Completed, remove from queue -- #
-                self.kernel.remove_from_io_queue(pcb)
-                sync_print(
-                    f'DEBUG: [DMAChannel] Ended with PID {pcb.job_id} state {pcb.state}'
-                ) if DMAChannelDEBUG is True else None
+            with self.kernel.io_ready:
+                self.kernel.io_ready.wait_for(lambda: self.kernel.has_io_jobs() or not self.__is_running)
+            pcb = self.claim_io_request()
+            if pcb is not None:
+                self.transfer(pcb)
+
+    def service_io_request(self) -> int:
+        """     Claims and copies the next IO request, returns the page count.     """
+        pcb = self.claim_io_request()
+        return 0 if pcb is None else self.transfer(pcb)
+
+    def claim_io_request(self) -> PCB:
+        """     Takes the oldest IO request off the queue for this channel, None if there is none.     """
+        pcb = self.kernel.take_io_request()
+        if pcb is not None:
+            # -- A CPU running ahead in the event driver may stamp its request a tick late -- #
+            waited = max(0, statistics.clock() - self.kernel.io_queue.get_queued_time(pcb))
+            self.requests += 1
+            self.queue_wait += waited
+            self.max_queue_wait = max(self.max_queue_wait, waited)
+        return pcb
+
+    def transfer(self, pcb: PCB) -> int:
+        """     Copies the pages of a claimed IO request from RAM to cache, returns the page count.     """
+        sync_print(
+            f'DEBUG: [DMAChannel {self.channel_id}] Activated!'
+        ) if DMAChannelDEBUG is True else None
+        started = statistics.clock()
+        started_ns = now()
+        # -- pcb stays in the IO queue until its pages are copied -- #
+        cached = self.kernel.read_pages_from_io_queue(pcb)
+        page_table = pcb.get_page_table()
+        pcb_cache = pcb.cpu_state.get_cache()
+        cpu_cache = self.kernel.get_cpu_cache(pcb.cache_cpu_id)
+        for page_num in cached:
+            pcb.io_operations += 1
+            # -- find page in ram -- #
+            ram_address = page_table.get_page(page_num)
+            self.ram.page_manager.reference_frame(ram_address)
+            # -- copy ram --> cache, sets the valid / dirty bits -- #
+            pcb_cache.load_page(page_num, self.ram.ram[ram_address])
+            if cpu_cache is not None:
+                cpu_cache.fill(pcb, page_num)
+        # -- Completed, remove from queue -- #
+        self.kernel.remove_from_io_queue(pcb)
+        self.pages += len(cached)
+        self.busy_time += statistics.clock() - started
+        if PERF_COUNTERS is True:
+            counters = get_counters()
+            counters.record_latency('dma_service', started_ns)
+            counters.count('dma_pages', len(cached))
+        sync_print(
+            f'DEBUG: [DMAChannel {self.channel_id}] Ended with PID {pcb.job_id} state {pcb.state}'
+        ) if DMAChannelDEBUG is True else None
+        return len(cached)
+
+    def get_throughput(self) -> float:
+        """     Pages copied per unit of busy time.     """
+        return self.pages / self.busy_time if self.busy_time > 0 else 0.0
+
+    def get_mean_queue_wait(self) -> float:
+        return self.queue_wait / self.requests if self.requests > 0 else 0.0
 
     @synchronized
     def end_daemon(self):
         self.__is_running = False
+        with self.kernel.io_ready:
+            self.kernel.io_ready.notify_all()
@@ -4,10 +4,34 @@ from os_.ram import RAM
 from os_.kernel import Kernel
 from os_.page_manager import PageManager
 from os_.loader import Loader
-from os_.config import SCHEDULING_TYPE, CORE_DUMPS, statistics
+from os_.scheduling_policy import SchedulingPolicy, get_policy
+from os_.job_image import ImageLoader, compile_job_image, is_job_image_stale
+from os_.config import (
+    SCHEDULING_TYPE,
+    DRIVER_MODE,
+    JOB_IMAGE,
+    JOB_IMAGE_SUFFIX,
+    DISK_FILE,
+    DISK_CAPACITY,
+    TIME_QUANTUM,
+    PAGE_REPLACEMENT,
+    READAHEAD_PAGES,
+    CPU_CACHE_REPLACEMENT,
+    TLB_REPLACEMENT,
+    PAGE_SIZE,
+    CORE_DUMPS,
+    DECODE_CACHE,
+    PERF_COUNTERS,
+    PERF_COUNTERS_FILE,
+    statistics,
+)
 from os_.longer_scheduler import LongScheduler
 #from os_.short_scheduler_phase1 import ShortScheduler
 from os_.short_scheduler_phase2 import ShortScheduler
+from os_.short_scheduler_event import EventScheduler
+from os_.statistics import get_hit_rate
+from os_.perf_counters import get_report, export_json
+from os_.synchronization import LOCK_MODE, lock_report
 from os_.sync_print import sync_print
 
 OS_DRIVER_DEBUG = True
@@ -15,8 +39,10 @@ OS_DRIVER_DEBUG = True
 
 class OSDriver:
 
-    def __init__(self, program_file: str):
-        self.disk = Disk()
+    def __init__(self, program_file: str, policy: SchedulingPolicy = None):
+        self.policy = policy if policy is not None else get_policy(SCHEDULING_TYPE)
+        # -- A reopened disk file keeps the jobs of past runs, these are loaded after them -- #
+        self.disk = Disk(capacity=DISK_CAPACITY, path=DISK_FILE)
         self.ram = RAM()
         self.kernel = Kernel()
         self.page_manager = PageManager(
@@ -24,49 +50,164 @@ class OSDriver:
             kernel=self.kernel,
             ram=self.ram,
         )
-        self.loader = Loader(
-            disk=self.disk,
-            kernel=self.kernel,
-            program_file=program_file
-        )
+        if JOB_IMAGE is True:
+            image_file = program_file + JOB_IMAGE_SUFFIX
+            if is_job_image_stale(program_file=program_file, image_file=image_file) is True:
+                compile_job_image(program_file=program_file, image_file=image_file)
+            self.loader = ImageLoader(
+                disk=self.disk,
+                kernel=self.kernel,
+                image_file=image_file
+            )
+        else:
+            self.loader = Loader(
+                disk=self.disk,
+                kernel=self.kernel,
+                program_file=program_file
+            )
+        sync_print(
+            f'DEBUG: [OSDriver] Loader parsed {self.loader.jobs_parsed} jobs '
+            f'({round(self.loader.get_parse_rate())} jobs/s).'
+        ) if OS_DRIVER_DEBUG is True else None
+        dedup = self.page_manager.dedup
+        if dedup is not None:
+            dedup.dedup_disk(self.kernel.get_pcbs())
+            sync_print(
+                f'DEBUG: [OSDriver] Dedup {dedup.pages_scanned} pages on {dedup.disk_pages} Disk pages '
+                f'({round(dedup.get_dedup_ratio(), ndigits=2)}x), '
+                f'{(dedup.pages_scanned - dedup.disk_pages) * PAGE_SIZE} words saved.'
+            ) if OS_DRIVER_DEBUG is True else None
         sync_print('DEBUG: [OSDriver] __init__ completed.') if OS_DRIVER_DEBUG is True else None
 
     def run(self):
         start_time = time.time()
-        if SCHEDULING_TYPE == 'FIFO':
-            self.kernel.sort_by_fifo()
-        elif SCHEDULING_TYPE == 'SJF':
-            self.kernel.sort_by_shortest_job_first()
-        elif SCHEDULING_TYPE == 'Priority':
-            self.kernel.sort_by_priority()
-        else:
-            raise UnexpectedOSDriverError(f'Unsupported SCHEDULING_TYPE {SCHEDULING_TYPE}.')
+        self.kernel.set_policy(self.policy)
 
         self.ram.init_page_manager(self.page_manager)
 
         CORE_DUMPS.set_ram(ram=self.ram)
 
-        ls = LongScheduler(ram=self.ram, disk=self.disk, kernel=self.kernel)
+        # -- Before the LongScheduler, jobs arrive on the statistics clock the ShortScheduler runs on -- #
+        if DRIVER_MODE == 'Threaded':
+            ss = ShortScheduler(ram=self.ram, kernel=self.kernel, page_manager=self.page_manager)
+        elif DRIVER_MODE == 'Event':
+            ss = EventScheduler(ram=self.ram, kernel=self.kernel, page_manager=self.page_manager)
+        else:
+            raise UnexpectedOSDriverError(f'Unsupported DRIVER_MODE {DRIVER_MODE}.')
+
+        run_start = statistics.clock()
+
+        ls = LongScheduler(ram=self.ram, disk=self.disk, kernel=self.kernel, page_manager=self.page_manager)
         ls.run()
 
         sync_print(f'DEBUG: [OSDriver] LongScheduler loaded {self.kernel.get_queue_size()} jobs.') if OS_DRIVER_DEBUG is True else None
 
-        ss = ShortScheduler(ram=self.ram, kernel=self.kernel, page_manager=self.page_manager)
         ss.run()
 
         sync_print('DEBUG: [OSDriver] ShortScheduler completed.') if OS_DRIVER_DEBUG is True else None
 
         # -- Waiting to finish -- #
 
+        elapsed = statistics.clock() - run_start
         for cpu in ss.cpu_bank:
-            while cpu.is_process_running() is True:
-                pass
-            sync_print(f'DEBUG: [OSDriver] CPU {cpu.cpu_id} completed {cpu.jobs_completed} jobs.') if OS_DRIVER_DEBUG is True else None
-
-        sync_print(f'DEBUG: [OSDriver] Final in {round(time.time()-start_time, ndigits=2)}s.') if OS_DRIVER_DEBUG is True else None
+            cpu.wait_until_idle()
+            cpu.end_cpu()
+            statistics.save_cpu_to_report(cpu=cpu, elapsed=elapsed, steals=self.kernel.get_steals(cpu.cpu_id))
+            sync_print(
+                f'DEBUG: [OSDriver] CPU {cpu.cpu_id} cache {cpu.get_cache_hits()} hits, {cpu.cache_misses} misses '
+                f'({round(get_hit_rate(cpu.get_cache_hits(), cpu.cache_misses) * 100, ndigits=2)}% hit rate).'
+            ) if OS_DRIVER_DEBUG is True else None
+            cpu_cache = cpu.cpu_cache
+            sync_print(
+                f'DEBUG: [OSDriver] CPU {cpu.cpu_id} {CPU_CACHE_REPLACEMENT} cache {cpu_cache.set_count} sets of '
+                f'{cpu_cache.ways} lines, {cpu_cache.fills} fills, {cpu_cache.evictions} evictions, '
+                f'{cpu_cache.write_backs} dirty write-backs, {cpu_cache.overflows} overflowed sets.'
+            ) if OS_DRIVER_DEBUG is True and cpu_cache is not None else None
+            tlb = cpu.tlb
+            sync_print(
+                f'DEBUG: [OSDriver] CPU {cpu.cpu_id} {TLB_REPLACEMENT} TLB {tlb.hits} hits, {tlb.misses} misses '
+                f'({round(get_hit_rate(tlb.hits, tlb.misses) * 100, ndigits=2)}% hit rate), '
+                f'{tlb.shootdowns} shootdowns.'
+            ) if OS_DRIVER_DEBUG is True and tlb is not None else None
+
+        run_time = time.time() - start_time
+        instructions = sum(cpu.instructions_executed for cpu in ss.cpu_bank)
+        sync_print(f'DEBUG: [OSDriver] Final in {round(run_time, ndigits=2)}s.') if OS_DRIVER_DEBUG is True else None
+        sync_print(
+            f'DEBUG: [OSDriver] Simulated {ss.engine.get_time()} ticks, '
+            f'{ss.engine.events_processed} events.'
+        ) if OS_DRIVER_DEBUG is True and DRIVER_MODE == 'Event' else None
+        sync_print(
+            f'DEBUG: [OSDriver] Executed {instructions} instructions '
+            f'({round(instructions / run_time)} instructions/s).'
+        ) if OS_DRIVER_DEBUG is True else None
+        sync_print(
+            f'DEBUG: [OSDriver] Decode cache {len(DECODE_CACHE)} words, '
+            f'{DECODE_CACHE.hits} hits, {DECODE_CACHE.misses} misses '
+            f'({round(DECODE_CACHE.hit_rate() * 100, ndigits=2)}% hit rate).'
+        ) if OS_DRIVER_DEBUG is True else None
+        sync_print(
+            f'DEBUG: [OSDriver] Skipped {sum(cpu.interrupt_checks_avoided for cpu in ss.cpu_bank)} of '
+            f'{sum(cpu.fetches for cpu in ss.cpu_bank)} fetch interrupt checks (MMU lock acquisitions).'
+        ) if OS_DRIVER_DEBUG is True else None
+        for dma in ss.dma_channels:
+            sync_print(
+                f'DEBUG: [OSDriver] DMA channel {dma.channel_id} {dma.requests} requests, {dma.pages} pages, '
+                f'{round(dma.get_throughput(), ndigits=2)} pages per busy unit, queue wait mean '
+                f'{round(dma.get_mean_queue_wait(), ndigits=6)} max {round(dma.max_queue_wait, ndigits=6)}.'
+            ) if OS_DRIVER_DEBUG is True else None
+        occupancy = self.page_manager.frames.get_occupancy()
+        dedup = self.page_manager.dedup
+        sync_print(
+            f'DEBUG: [OSDriver] RAM frames {occupancy["used"]} of {occupancy["frames"]} used, '
+            f'peak {occupancy["peak_used"]}, {occupancy["allocations"]} allocations, {occupancy["frees"]} frees.'
+        ) if OS_DRIVER_DEBUG is True else None
+        sync_print(
+            f'DEBUG: [OSDriver] {PAGE_REPLACEMENT} page replacement {self.page_manager.evictions} evictions, '
+            f'{self.page_manager.refaults} refaults, {self.page_manager.write_backs} dirty write-backs.'
+        ) if OS_DRIVER_DEBUG is True and PAGE_REPLACEMENT is not None else None
+        sync_print(
+            f'DEBUG: [OSDriver] Dedup {dedup.shared_maps} page faults mapped a shared frame, '
+            f'peak {dedup.peak_frames_saved} frames ({dedup.peak_frames_saved * PAGE_SIZE} words) saved, '
+            f'{dedup.frame_copies} frames and {dedup.disk_copies} Disk pages copied on write, '
+            f'{dedup.disk_fallbacks} written to Disk with RAM full.'
+        ) if OS_DRIVER_DEBUG is True and dedup is not None else None
+        sync_print(
+            f'DEBUG: [OSDriver] Readahead {self.page_manager.prefetches} pages prefetched, '
+            f'{self.page_manager.prefetch_hits} touched (page faults saved).'
+        ) if OS_DRIVER_DEBUG is True and READAHEAD_PAGES > 0 else None
+        write_back = ss.write_back
+        sync_print(
+            f'DEBUG: [OSDriver] Write-back {write_back.pages_written} pages in {write_back.flushes} flushes, '
+            f'{write_back.jobs_queued} jobs queued, {write_back.sweeps} sweeps, latency mean '
+            f'{round(write_back.get_mean_latency(), ndigits=6)} max {round(write_back.max_latency, ndigits=6)}.'
+        ) if OS_DRIVER_DEBUG is True and write_back is not None else None
+        sync_print(
+            f'DEBUG: [OSDriver] HLT wrote {ss.mmu.halt_pages} pages in {ss.mmu.halts} halts, '
+            f'{round(ss.mmu.halt_time / 10 ** 6, ndigits=3)}ms, '
+            f'max {round(ss.mmu.max_halt_time / 10 ** 6, ndigits=3)}ms.'
+        ) if OS_DRIVER_DEBUG is True else None
+        turnaround_mean, turnaround_p95 = statistics.get_turnaround_summary()
+        sync_print(
+            f'DEBUG: [OSDriver] {self.policy.name} turnaround mean {round(turnaround_mean, ndigits=3)}, '
+            f'p95 {round(turnaround_p95, ndigits=3)}, '
+            f'{sum(cpu.preemptions for cpu in ss.cpu_bank)} preemptions (TIME_QUANTUM {TIME_QUANTUM}).'
+        ) if OS_DRIVER_DEBUG is True else None
+        translators = [cpu.translator for cpu in ss.cpu_bank if cpu.translator is not None]
+        sync_print(
+            f'DEBUG: [OSDriver] Translated {sum(t.blocks_translated for t in translators)} blocks, '
+            f'{sum(t.blocks_executed for t in translators)} block runs, '
+            f'{sum(t.fallbacks for t in translators)} interpreter fallbacks.'
+        ) if OS_DRIVER_DEBUG is True and translators else None
+        for name, acquisitions, contended, wait_ns in lock_report():
+            sync_print(
+                f'DEBUG: [OSDriver] {LOCK_MODE} locks {name} {acquisitions} acquisitions, '
+                f'{contended} contended, {round(wait_ns / 10 ** 6, ndigits=3)}ms waiting.'
+            ) if OS_DRIVER_DEBUG is True else None
 
         # -- Create the Disk Core Dump -- #
         CORE_DUMPS.create_disk_dump(self.disk)
+        self.disk.close()
 
         # -- Save the Core Dumps to file -- #
         CORE_DUMPS.save_to_file()
@@ -74,6 +215,10 @@ class OSDriver:
         # -- Print Stats Report -- #
         statistics.print_report()
 
+        # -- Save the Performance Counters to file -- #
+        if PERF_COUNTERS is True:
+            export_json(f'{CORE_DUMPS.path}/{PERF_COUNTERS_FILE}', get_report(ss.cpu_bank))
+
 
 class UnexpectedOSDriverError(Exception):
     pass
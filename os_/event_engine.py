@@ -0,0 +1,60 @@
+"""
+    A single-threaded discrete-event engine on a simulated clock.
+
+    Processes are generators. A process yields the number of ticks
+    it needs before it runs again, or WAIT to park until some other
+    process calls notify(). Processes due at the same tick run in the
+    order they were scheduled, so a run is fully reproducible.
+"""
+from heapq import heappush, heappop
+from os_.sync_print import sync_print
+
+EVENT_ENGINE_DEBUG = False
+
+WAIT = None
+
+
+class EventEngine:
+
+    __slots__ = ['now', 'events', 'parked', 'sequence', 'events_processed']
+
+    def __init__(self):
+        self.now = 0
+        self.events = list()
+        self.parked = list()
+        self.sequence = 0
+        self.events_processed = 0
+
+    def get_time(self) -> int:
+        return self.now
+
+    def spawn(self, process, delay: int = 0):
+        heappush(self.events, (self.now + delay, self.sequence, process))
+        self.sequence += 1
+
+    def notify(self):
+        """     Reschedules every parked process at the current tick.     """
+        parked, self.parked = self.parked, list()
+        for process in parked:
+            self.spawn(process)
+
+    def next_event_time(self) -> float:
+        return self.events[0][0] if self.events else float('inf')
+
+    def run(self) -> int:
+        """     Runs until no process is scheduled, returns the final tick.     """
+        while self.events:
+            self.now, sequence, process = heappop(self.events)
+            self.events_processed += 1
+            try:
+                delay = next(process)
+            except StopIteration:
+                continue
+            if delay is WAIT:
+                self.parked.append(process)
+            else:
+                self.spawn(process, delay=delay)
+        sync_print(
+            f'DEBUG: [EventEngine] Idle at tick {self.now}, {len(self.parked)} processes parked.'
+        ) if EVENT_ENGINE_DEBUG is True else None
+        return self.now
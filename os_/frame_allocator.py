@@ -0,0 +1,123 @@
+"""
+    Free RAM frame allocator of the PageManager.
+
+    A bytearray bitmap holds one free flag per frame and a deque holds
+    the free frames in the order they were freed, so allocate(...) hands
+    frames out first freed, first allocated, as the old free list did.
+    Reserving a frame leaves its deque entry behind, to be skipped once
+    it reaches the front; a per frame generation tells such an entry
+    from the frame being freed again. allocate, free and reserve are
+    O(1), amortized.
+
+    allocate_extent(...) takes n contiguous free frames, searching the
+    bitmap with bytearray.find, O(frames) but in C.
+"""
+from collections import deque
+from os_.synchronization import synchronized
+from os_.sync_print import sync_print
+
+FRAME_ALLOCATOR_DEBUG = False
+
+FREE = 1
+USED = 0
+
+
+class FrameAllocator:
+
+    __slots__ = [
+        'capacity', 'bitmap', 'order', 'generation', 'free_count',
+        'peak_used', 'allocations', 'frees', 'extents',
+        '__weakref__',
+    ]
+
+    def __init__(self, capacity: int):
+        # -- Every frame starts used, RAM frees them once it is attached -- #
+        self.capacity = capacity
+        self.bitmap = bytearray(capacity)
+        self.order = deque()
+        self.generation = [0] * capacity
+        self.free_count = 0
+
+        # -- Occupancy -- #
+        self.peak_used = 0
+        self.allocations = 0
+        self.frees = 0
+        self.extents = 0
+
+    def __len__(self):
+        """ Number of free frames"""
+        return self.free_count
+
+    def is_free(self, frame: int) -> bool:
+        return self.bitmap[frame] == FREE
+
+    @synchronized
+    def free(self, frame: int):
+        if self.bitmap[frame] == FREE:
+            return
+        self.bitmap[frame] = FREE
+        self.generation[frame] += 1
+        self.order.append((frame, self.generation[frame]))
+        self.free_count += 1
+        self.frees += 1
+
+    @synchronized
+    def reserve(self, frame: int):
+        """     Marks a frame used without allocating it, a no-op if it is used.     """
+        if self.bitmap[frame] == FREE:
+            self.take(frame)
+
+    @synchronized
+    def allocate(self) -> int:
+        """     The free frame that was freed first.     """
+        while self.order:
+            frame, generation = self.order.popleft()
+            if self.bitmap[frame] == FREE and self.generation[frame] == generation:
+                self.take(frame)
+                self.allocations += 1
+                return frame
+        raise UnexpectedFrameAllocatorError('allocate(...) no free frame left.')
+
+    @synchronized
+    def allocate_extent(self, n: int) -> int:
+        """     Allocates n contiguous free frames, returns the first one.     """
+        first = self.bitmap.find(bytes([FREE]) * n)
+        if first < 0:
+            raise UnexpectedFrameAllocatorError(f'allocate_extent(...) no {n} contiguous free frames.')
+        for frame in range(first, first + n):
+            self.take(frame)
+        self.allocations += n
+        self.extents += 1
+        sync_print(f'DEBUG: [FrameAllocator] Extent {first} - {first + n - 1}.') if FRAME_ALLOCATOR_DEBUG is True else None
+        return first
+
+    def take(self, frame: int):
+        self.bitmap[frame] = USED
+        self.free_count -= 1
+        used = self.capacity - self.free_count
+        if used > self.peak_used:
+            self.peak_used = used
+        # -- Drop old entries once they outnumber the free frames -- #
+        if len(self.order) > 2 * self.free_count + 64:
+            self.compact()
+
+    def compact(self):
+        self.order = deque(
+            (frame, generation) for frame, generation in self.order
+            if self.bitmap[frame] == FREE and self.generation[frame] == generation
+        )
+
+    def get_occupancy(self) -> dict:
+        return {
+            'frames': self.capacity,
+            'free': self.free_count,
+            'used': self.capacity - self.free_count,
+            'peak_used': self.peak_used,
+            'allocations': self.allocations,
+            'frees': self.frees,
+            'extents': self.extents,
+        }
+
+
+class UnexpectedFrameAllocatorError(Exception):
+    pass
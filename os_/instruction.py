@@ -6,12 +6,19 @@
 
 class Instruction:
 
+    """
+        Decoded form of a single 32-bit word. Every field
+        is kept as an int so that the CPU never has to
+        re-parse hex strings while executing.
+    """
+
     __slots__ = [
         'format', 'opcode', 'reg1', 'reg2',
-        'breg', 'dstreg', 'address'
+        'breg', 'dstreg', 'address', 'key',
     ]
 
     def __init__(self):
+        self.key = None
         self.format = None
         self.opcode = None
         self.reg1 = None
@@ -23,77 +30,110 @@ class Instruction:
     def __repr__(self):
         """     Troubleshooting     """
         return f'format {self.format} opcode {self.opcode} ' \
-            'reg1 {self.reg1} reg2 {self.reg2} breg {self.breg} ' \
-            'dstreg {self.dstreg} address {self.address}'
+            f'reg1 {self.reg1} reg2 {self.reg2} breg {self.breg} ' \
+            f'dstreg {self.dstreg} address {self.address}'
 
-    def decode_instruction(self, instruction: str):
-        instruction = instruction.replace('0x', '')
-        instruction_bin = self.to_binary(instruction)
-        self.format = self.to_hex(instruction_bin[0:2])
-        self.opcode = self.to_hex(instruction_bin[2:8])
+    def decode_instruction(self, instruction: int):
+        word = instruction
+        self.format = word >> 30
+        self.opcode = (word >> 24) & 0x3F
+        self.key = dispatch_key(self.format, self.opcode)
 
         # ----------------------------------- #
         # -- Arithmetic instruction format -- #
         # ----------------------------------- #
 
-        if self.format == '0x0':
-            self.reg1 = self.to_hex(instruction_bin[8:12])
-            self.reg2 = self.to_hex(instruction_bin[12:16])
+        if self.format == 0x0:
+            self.reg1 = (word >> 20) & 0xF
+            self.reg2 = (word >> 16) & 0xF
             self.breg = None
-            self.dstreg = self.to_hex(instruction_bin[16:20])
-            self.address = self.to_hex(instruction_bin[20:32])
+            self.dstreg = (word >> 12) & 0xF
+            self.address = word & 0xFFF
 
         # --------------------------------------------- #
         # -- Conditional Branch and Immediate format -- #
         # --------------------------------------------- #
 
-        elif self.format == '0x1':
+        elif self.format == 0x1:
             self.reg1 = None
             self.reg2 = None
-            self.breg = self.to_hex(instruction_bin[8:12])
-            self.dstreg = self.to_hex(instruction_bin[12:16])
-            self.address = self.to_hex(instruction_bin[16:32])
+            self.breg = (word >> 20) & 0xF
+            self.dstreg = (word >> 16) & 0xF
+            self.address = word & 0xFFFF
 
         # ------------------------------- #
         # -- Unconditional Jump format -- #
         # ------------------------------- #
 
-        elif self.format == '0x2':
+        elif self.format == 0x2:
             self.reg1 = None
             self.reg2 = None
             self.breg = None
             self.dstreg = None
-            self.address = self.to_hex(instruction_bin[8:32])
+            self.address = word & 0xFFFFFF
 
         # ----------------------------------------- #
         # -- Input and Output instruction format -- #
         # ----------------------------------------- #
 
-        elif self.format == '0x3':
-            self.reg1 = self.to_hex(instruction_bin[8:12])
-            self.reg2 = self.to_hex(instruction_bin[12:16])
+        elif self.format == 0x3:
+            self.reg1 = (word >> 20) & 0xF
+            self.reg2 = (word >> 16) & 0xF
             self.breg = None
             self.dstreg = None
-            self.address = self.to_hex(instruction_bin[16:32])
+            self.address = word & 0xFFFF
 
         # ----------- #
         # -- ERROR -- #
         # ----------- #
 
         else:
-            raise UnexpectedInstructionError(f'Unable to decode_instruction(instruction={instruction}).')
+            raise UnexpectedInstructionError(f'Unable to decode_instruction(instruction={hex(instruction)}).')
+
 
-    @staticmethod
-    def to_binary(instruction: str) -> str:
-        instruction_bin = bin(int(instruction, 16))[2:]
-        while len(instruction_bin) < 32:
-            instruction_bin = "0" + instruction_bin
-        return instruction_bin
+class DecodeCache:
 
-    @staticmethod
-    def to_hex(binary: str) -> str:
-        return hex(int(binary, 2))
+    """
+        Shared predecode stage. Each distinct word is decoded
+        once into an Instruction and then served from here on
+        every later fetch, by any CPU. Decoded Instructions are
+        shared, so they must be treated as read-only.
+    """
+
+    __slots__ = ['cache', 'hits', 'misses']
+
+    def __init__(self):
+        self.cache = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return self.cache.__len__()
+
+    def decode(self, word: int) -> Instruction:
+        try:
+            instruction = self.cache[word]
+        except KeyError:
+            instruction = Instruction()
+            instruction.decode_instruction(word)
+            self.cache[word] = instruction
+            self.misses += 1
+            return instruction
+        self.hits += 1
+        return instruction
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
 
 
 class UnexpectedInstructionError(Exception):
     pass
+
+
+def dispatch_key(format_: int, opcode: int) -> int:
+    """
+    Packs an integer (format, opcode) pair into a single
+    int in range(256), which is the top byte of the word.
+    """
+    return (format_ << 6) | opcode
@@ -0,0 +1,153 @@
+"""
+    Precompiled binary image of a job file.
+
+    compile_job_image(...) loads a job file once through Loader and
+    saves the resulting Disk and PCBs. ImageLoader boots from that
+    image by memory-mapping it and copying the word section onto Disk
+    in a single slice, so no word is parsed again.
+
+    Layout, little-endian
+    -- header   magic, version, PAGE_SIZE, job count, disk pages used
+    -- index    one entry per job, in load order
+    -- used     one byte per disk page, the number of words it holds
+    -- words    disk pages used * PAGE_SIZE packed 32-bit words,
+                aligned on 4 bytes
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from os_.kernel import Kernel
+from os_.pcb import PCB
+from os_.disk import Disk
+from os_.loader import Loader
+from os_.config import PAGE_SIZE, DISK_CAPACITY
+from os_.sync_print import sync_print
+
+JOB_IMAGE_DEBUG = False
+
+MAGIC = b'AZJI'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHII')
+
+# -- job id, priority, job size, word count, input / output / temp -- #
+# -- buffer sizes, disk address begin and end                       -- #
+ENTRY = struct.Struct('<8s8sIIIIIII')
+
+
+def compile_job_image(program_file: str, image_file: str):
+    disk = Disk(capacity=DISK_CAPACITY)
+    kernel = Kernel()
+    Loader(program_file=program_file, disk=disk, kernel=kernel)
+    page_count = disk.get_next_free_page()
+
+    with open(image_file, 'wb') as fh:
+        fh.write(HEADER.pack(MAGIC, VERSION, PAGE_SIZE, kernel.get_queue_size(), page_count))
+        for pcb in kernel.pcb_queue:
+            # -- Sizes are stored as whole pages, which rebuilds the same buffers -- #
+            fh.write(ENTRY.pack(
+                pcb.job_id.encode(),
+                pcb.priority.encode(),
+                pcb.job_size,
+                len(pcb.page_table) * PAGE_SIZE,
+                pcb.len_input_buffer(),
+                pcb.len_output_buffer(),
+                pcb.len_temp_buffer(),
+                pcb.get_disk_address_begin(),
+                pcb.get_disk_address_end(),
+            ))
+        fh.write(bytes(disk.used[:page_count]))
+        fh.write(bytes(-fh.tell() % 4))
+        words = array('I', disk.words[:page_count * PAGE_SIZE])
+        if sys.byteorder != 'little':
+            words.byteswap()
+        fh.write(words.tobytes())
+    sync_print(
+        f'DEBUG: [JobImage] Compiled {program_file} into {image_file}, '
+        f'{kernel.get_queue_size()} jobs on {page_count} pages.'
+    ) if JOB_IMAGE_DEBUG is True else None
+
+
+def is_job_image_stale(program_file: str, image_file: str) -> bool:
+    if os.path.exists(image_file) is False:
+        return True
+    return os.path.getmtime(image_file) < os.path.getmtime(program_file)
+
+
+class ImageLoader:
+
+    """
+        Loads a compiled job image onto Disk and into the Kernel,
+        the same way Loader does for a text job file.
+    """
+
+    __slots__ = ['image_file', 'disk', 'kernel', 'jobs_parsed', 'parse_time']
+
+    def __init__(self, image_file: str, disk: Disk, kernel: Kernel):
+        self.image_file = image_file
+        self.disk = disk
+        self.kernel = kernel
+        self.jobs_parsed = 0
+        self.parse_time = 0.0
+        start = time.perf_counter()
+        with open(self.image_file, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as image:
+            with memoryview(image) as view:
+                self.load_image(view)
+        self.parse_time = time.perf_counter() - start
+
+    def load_image(self, view: memoryview):
+        magic, version, page_size, job_count, page_count = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION or page_size != PAGE_SIZE:
+            raise UnexpectedJobImageError(
+                f'{self.image_file} is not a version {VERSION} job image for PAGE_SIZE {PAGE_SIZE}.'
+            )
+        # -- Loaded after the pages already on Disk, every address moves by base -- #
+        base = self.disk.get_next_free_page()
+        if base + page_count > len(self.disk):
+            raise UnexpectedJobImageError(
+                f'{self.image_file} needs {page_count} pages, Disk has {len(self.disk) - base} free.'
+            )
+
+        offset = HEADER.size
+        entries = list(ENTRY.iter_unpack(view[offset:offset + job_count * ENTRY.size]))
+        offset += job_count * ENTRY.size
+        used = view[offset:offset + page_count]
+        offset += page_count
+        offset += -offset % 4
+
+        # -- Words go onto Disk in one copy, then the used counts per page -- #
+        word_count = page_count * PAGE_SIZE
+        with view[offset:offset + word_count * 4].cast('I') as words:
+            if sys.byteorder != 'little':
+                words = array('I', words)
+                words.byteswap()
+            memoryview(self.disk.words)[base * PAGE_SIZE:base * PAGE_SIZE + word_count] = words
+        self.disk.used[base:base + page_count] = used
+        used.release()
+        self.disk.set_next_free_page(base + page_count)
+
+        for job_id, priority, job_size, job_words, input_size, output_size, temp_size, \
+                begin, end in entries:
+            pcb = PCB(
+                job_id=job_id.rstrip(b'\0').decode(),
+                job_size=job_size,
+                priority=priority.rstrip(b'\0').decode(),
+            )
+            pcb.set_page_table(word_count=job_words)
+            pcb.set_disk_address_begin(address=base + begin)
+            pcb.set_input_buffer(size=input_size)
+            pcb.set_output_buffer(size=output_size)
+            pcb.set_temp_buffer(size=temp_size)
+            pcb.set_disk_address_end(base + end)
+            self.kernel.add_pcb(pcb)
+            self.jobs_parsed += 1
+
+    def get_parse_rate(self) -> float:
+        return self.jobs_parsed / self.parse_time if self.parse_time > 0 else 0.0
+
+
+class UnexpectedJobImageError(Exception):
+    pass
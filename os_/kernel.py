@@ -1,68 +1,221 @@
-from heapq import heappush, heappop
+import threading
+from heapq import heappush, heappop, heapify
 from os_.memory_mapping import MemoryMapping
 from os_.pcb import PCB
-from os_.config import RUNNING_STATE
+from os_.scheduling_policy import SchedulingPolicy, LoadOrderPolicy
+from os_.config import READY_STATE, RUNNING_STATE, WAITING_STATE, WORK_STEALING, STEAL_AFFINITY, PERF_COUNTERS
+from os_.perf_counters import get_counters
 from os_.synchronization import synchronized
 from os_.sync_print import sync_print
 
 
 class Kernel:
 
-    __slots__ = ['pcb_queue', 'page_fault_queue', 'io_queue']
+    __slots__ = [
+        'pcb_queue', 'page_fault_queue', 'io_queue', 'policy',
+        'ready_heaps', 'running', 'next_rank', 'ready_lock', 'steals', 'dispatching',
+        'io_ready', 'page_fault_ready', 'dispatch_ready', 'dispatch_generation',
+        'cpu_caches', 'tlbs', 'translators',
+        '__weakref__',
+    ]
 
-    def __init__(self):
-        self.pcb_queue = list()
+    def __init__(self, policy: SchedulingPolicy = None):
+        # -- PCB -> rank, the (policy key, load order) it is dispatched by -- #
+        self.pcb_queue = dict()
+        self.policy = policy if policy is not None else LoadOrderPolicy()
         self.page_fault_queue = MemoryMapping()
         self.io_queue = MemoryMapping()
 
-    @synchronized
-    def sort_by_fifo(self):
-        heap = list()
-        while self.pcb_queue:
-            pcb = self.pcb_queue.pop(0)
-            heappush(heap, (int(pcb.job_id, 16), pcb))
-        while heap:
-            pos, pcb = heappop(heap)
-            self.pcb_queue.append(pcb)
+        # -- Ready heaps of (rank, PCB) per assigned_cpu_id, None for -- #
+        # -- unassigned PCBs, and the PCBs last seen RUNNING. Entries -- #
+        # -- are checked, and moved, when they reach the top.        -- #
+        self.ready_heaps = dict()
+        self.running = set()
+        self.next_rank = 0
+        self.ready_lock = threading.Lock()
 
-    @synchronized
-    def sort_by_priority(self):
-        heap = list()
-        while self.pcb_queue:
-            pcb = self.pcb_queue.pop(0)
-            heappush(heap, (int(pcb.priority, 16), pcb))
-        while heap:
-            pos, pcb = heappop(heap)
-            self.pcb_queue.append(pcb)
+        # -- cpu_id -> PCBs it took from a peer's ready heap, and the -- #
+        # -- PCB get_next_pcb(...) last gave its dispatcher           -- #
+        self.steals = dict()
+        self.dispatching = dict()
+
+        # -- Conditions idle daemons and dispatchers block on -- #
+        self.io_ready = threading.Condition()
+        self.page_fault_ready = threading.Condition()
+        self.dispatch_ready = threading.Condition()
+        self.dispatch_generation = 0
+
+        # -- cpu_id -> CPUCache / TLB, empty unless CPU_CACHE_LINES / TLB_ENTRIES > 0 -- #
+        self.cpu_caches = dict()
+        self.tlbs = dict()
+        # -- cpu_id -> BlockTranslator, empty unless EXECUTION_ENGINE is Translated -- #
+        self.translators = dict()
 
     @synchronized
-    def sort_by_shortest_job_first(self):
-        heap = list()
-        while self.pcb_queue:
-            pcb = self.pcb_queue.pop(0)
-            heappush(heap, (pcb.job_size, pcb))
+    def set_policy(self, policy: SchedulingPolicy):
+        """     Re-keys every queued PCB and heapifies the ready heaps, O(n).     """
+        with self.ready_lock:
+            self.policy = policy
+            heaps = dict()
+            for pcb, (key, load_order) in self.pcb_queue.items():
+                rank = (policy.key(pcb), load_order)
+                self.pcb_queue[pcb] = rank
+                heaps.setdefault(pcb.assigned_cpu_id, list()).append((rank, pcb))
+            for heap in heaps.values():
+                heapify(heap)
+            self.ready_heaps = heaps
+            self.running = set()
+
+    def get_policy(self) -> SchedulingPolicy:
+        return self.policy
+
+    def enqueue_pcb(self, pcb: PCB):
+        self.pcb_queue[pcb] = (self.policy.key(pcb), self.next_rank)
+        self.next_rank += 1
+        self.push_ready(pcb)
+
+    def push_ready(self, pcb: PCB):
+        heap = self.ready_heaps.get(pcb.assigned_cpu_id)
+        if heap is None:
+            heap = self.ready_heaps[pcb.assigned_cpu_id] = list()
+        heappush(heap, (self.pcb_queue[pcb], pcb))
+
+    def peek_ready(self, cpu_id) -> tuple:
+        """     Returns the (rank, PCB) at the top of a ready heap, or None.     """
+        heap = self.ready_heaps.get(cpu_id)
         while heap:
-            pos, pcb = heappop(heap)
-            self.pcb_queue.append(pcb)
+            rank, pcb = heap[0]
+            if self.pcb_queue.get(pcb) != rank:
+                heappop(heap)
+            elif pcb.assigned_cpu_id != cpu_id:
+                heappop(heap)
+                self.push_ready(pcb)
+            elif pcb.get_state() == RUNNING_STATE:
+                heappop(heap)
+                self.running.add(pcb)
+            else:
+                return rank, pcb
+        return None
 
     @synchronized
     def get_pcb(self, index: int) -> PCB:
-        return self.pcb_queue[index]
+        return self.get_pcbs()[index]
+
+    def get_pcbs(self) -> list:
+        """     All queued PCBs in scheduling order, copied under ready_lock.     """
+        with self.ready_lock:
+            return sorted(self.pcb_queue, key=self.pcb_queue.__getitem__)
 
     @synchronized
     def get_next_pcb(self, cpu_id: int) -> PCB:
-        for pcb in self.pcb_queue:
-            if pcb.get_state() != RUNNING_STATE:
-                if pcb.assigned_cpu_id is None or pcb.assigned_cpu_id == cpu_id:
-                    return pcb
+        """
+            The first PCB in scheduling order that is not RUNNING and
+            is assigned to cpu_id or to no CPU. O(log n), plus a scan
+            of the at most CPU_COUNT PCBs last seen RUNNING.
+        """
+        with self.ready_lock:
+            for pcb in [pcb for pcb in self.running if pcb.get_state() != RUNNING_STATE]:
+                self.running.discard(pcb)
+                if pcb in self.pcb_queue:
+                    self.push_ready(pcb)
+            own = self.peek_ready(cpu_id)
+            shared = self.peek_ready(None)
+            if own is None and shared is None and WORK_STEALING is True:
+                pcb = self.steal_ready(cpu_id)
+                self.dispatching[cpu_id] = pcb
+                return pcb
+            if own is None or (shared is not None and shared[0] < own[0]):
+                own = shared
+            pcb = None if own is None else own[1]
+            self.dispatching[cpu_id] = pcb
+            return pcb
+
+    def steal_ready(self, cpu_id: int) -> PCB:
+        """
+            Takes the first runnable PCB, in scheduling order, of the peer
+            with the most runnable PCBs above STEAL_AFFINITY, or None. The
+            PCB is assigned to cpu_id here, under ready_lock, so its old
+            CPU sees it moved. A PCB a peer's dispatcher was just given is
+            left to it. O(n) over the peers' heaps, only run by a CPU that
+            has nothing else to dispatch.
+        """
+        stolen = None
+        most = STEAL_AFFINITY
+        for peer, heap in self.ready_heaps.items():
+            if peer is None or peer == cpu_id:
+                continue
+            ready = [
+                (rank, pcb) for rank, pcb in heap
+                if self.pcb_queue.get(pcb) == rank and pcb.assigned_cpu_id == peer
+                and self.is_runnable(pcb) is True
+            ]
+            stealable = [(rank, pcb) for rank, pcb in ready if pcb is not self.dispatching.get(peer)]
+            if len(ready) > most and stealable:
+                most = len(ready)
+                stolen = min(stealable)[1]
+        if stolen is None:
+            return None
+        stolen.assigned_cpu_id = cpu_id
+        stolen.steals += 1
+        self.push_ready(stolen)
+        self.steals[cpu_id] = self.steals.get(cpu_id, 0) + 1
+        return stolen
+
+    def is_runnable(self, pcb: PCB) -> bool:
+        """     READY, or WAITING on pages that have already arrived.     """
+        state = pcb.get_state()
+        if state == READY_STATE:
+            return True
+        return state == WAITING_STATE and not self.io_queue.contains(pcb) and \
+            not self.page_fault_queue.contains(pcb=pcb)
+
+    def get_steals(self, cpu_id: int) -> int:
+        return self.steals.get(cpu_id, 0)
+
+    def register_cpu_cache(self, cpu_cache):
+        self.cpu_caches[cpu_cache.cpu_id] = cpu_cache
+
+    def get_cpu_cache(self, cpu_id: int):
+        """     The CPUCache holding the lines of the job last run on cpu_id, None without one.     """
+        return self.cpu_caches.get(cpu_id)
+
+    def register_tlb(self, tlb):
+        self.tlbs[tlb.cpu_id] = tlb
+
+    def get_tlb(self, cpu_id: int):
+        return self.tlbs.get(cpu_id)
+
+    def register_translator(self, cpu_id: int, translator):
+        self.translators[cpu_id] = translator
 
     @synchronized
     def add_pcb(self, pcb: PCB):
-        self.pcb_queue.append(pcb)
+        with self.ready_lock:
+            self.enqueue_pcb(pcb)
+        self.notify_dispatchers()
+
+    @synchronized
+    def requeue_pcb(self, pcb: PCB):
+        """     Moves a preempted pcb behind the queued PCBs of the same key.     """
+        with self.ready_lock:
+            if pcb in self.pcb_queue:
+                self.running.discard(pcb)
+                self.enqueue_pcb(pcb)
+        self.notify_dispatchers()
+
+    @synchronized
+    def remove_pcb(self, pcb: PCB):
+        with self.ready_lock:
+            del self.pcb_queue[pcb]
+            self.running.discard(pcb)
+        self.notify_dispatchers()
 
     @synchronized
     def add_to_page_fault_queue(self, pcb: PCB, page_num: int):
         self.page_fault_queue.add_page_to_pcb(pcb, page_num)
+        if PERF_COUNTERS is True:
+            get_counters().sample_depth('page_fault_queue', self.page_fault_queue.size())
+        self.notify_page_fault_ready()
 
     @synchronized
     def get_job_from_page_fault_queue(self) -> PCB:
@@ -75,22 +228,63 @@ class Kernel:
     @synchronized
     def remove_from_page_fault_queue(self, pcb: PCB):
         self.page_fault_queue.remove_from_queue(pcb)
+        self.notify_dispatchers()
 
     @synchronized
     def add_to_io_queue(self, pcb: PCB, page_num: int):
         self.io_queue.add_page_to_pcb(pcb, page_num)
+        if PERF_COUNTERS is True:
+            get_counters().sample_depth('io_queue', self.io_queue.size())
+        with self.io_ready:
+            self.io_ready.notify()
 
     @synchronized
     def get_job_from_io_queue(self) -> PCB:
         return self.io_queue.get_next_pcb()
 
+    @synchronized
+    def take_io_request(self) -> PCB:
+        """     Claims the oldest IO request for a DMA channel, None if another channel got it first.     """
+        if self.io_queue.size() == 0:
+            return None
+        return self.io_queue.get_next_pcb()
+
     @synchronized
     def get_pages_from_io_queue(self, pcb: PCB) -> list:
         return self.io_queue.get_pages_for_pcb(pcb)
 
+    @synchronized
+    def read_pages_from_io_queue(self, pcb: PCB) -> list:
+        return self.io_queue.read_pages_for_pcb(pcb)
+
     @synchronized
     def remove_from_io_queue(self, pcb: PCB):
         self.io_queue.remove_from_queue(pcb)
+        self.notify_dispatchers()
+
+    # ------------------------------------------ #
+    # -- Events, so idle threads do not spin  -- #
+    # ------------------------------------------ #
+
+    def notify_page_fault_ready(self):
+        """     A page fault was queued or RAM frames were freed.     """
+        with self.page_fault_ready:
+            self.page_fault_ready.notify()
+
+    def notify_dispatchers(self):
+        """     The set of dispatchable PCBs, and so of evictable frames, may have changed.     """
+        with self.dispatch_ready:
+            self.dispatch_generation += 1
+            self.dispatch_ready.notify_all()
+        self.notify_page_fault_ready()
+
+    def get_dispatch_generation(self) -> int:
+        return self.dispatch_generation
+
+    def wait_for_dispatch_event(self, generation: int):
+        """     Blocks until notify_dispatchers(...) ran after generation was read.     """
+        with self.dispatch_ready:
+            self.dispatch_ready.wait_for(lambda: self.dispatch_generation != generation)
 
     def has_page_fault_jobs(self) -> bool:
         return self.page_fault_queue.size() > 0
@@ -98,6 +292,9 @@ class Kernel:
     def has_io_jobs(self) -> bool:
         return self.io_queue.size() > 0
 
+    def get_next_page_fault_page_count(self) -> int:
+        return self.page_fault_queue.get_next_page_count()
+
     def get_queue_size(self) -> int:
         return len(self.pcb_queue)
 
@@ -1,3 +1,4 @@
+import time
 from os_.kernel import Kernel
 from os_.pcb import PCB
 from os_.disk import Disk
@@ -9,40 +10,58 @@ class Loader:
         Custom program file loader per CS3502 Project Specifications.
     """
 
-    __slots__ = ['program_file', 'disk', 'kernel']
+    __slots__ = ['program_file', 'disk', 'kernel', 'jobs_parsed', 'parse_time']
 
     def __init__(self, program_file: str, disk: Disk, kernel: Kernel):
         self.program_file = program_file
         self.disk = disk
         self.kernel = kernel
+        self.jobs_parsed = 0
+        self.parse_time = 0.0
+        for job in self.parse_jobs():
+            self.load_job(job)
+
+    def parse_jobs(self):
+        """
+            Reads the program file one buffered line at a time and
+            yields every job as soon as its END line is read, so only
+            the job being parsed is held in memory.
+        """
         # -- Variables -- #
         attributes = dict()
         words = list()
-        # -- Iterate through program file -- #
-        lines = self.open_program_file()
-        while lines:
-            line = lines.pop(0)
-            if line.startswith('// JOB'):
-                attributes['job_id'] = line.split()[-3]
-                attributes['job_instr_count'] = int(line.split()[-2], 16)
-                attributes['job_priority'] = line.split()[-1]
-            elif line.startswith('// Data'):
-                attributes['data_input_buffer'] = int(line.split()[-3], 16)
-                attributes['data_output_buffer'] = int(line.split()[-2], 16)
-                attributes['data_temp_buffer'] = int(line.split()[-1], 16)
-            elif line.__contains__('END'):
-                # -- Load Job -- #
-                self.load_job(
-                    {
+        start = time.perf_counter()
+        with open(self.program_file, 'r') as fh:
+            for line in fh:
+                line = line.rstrip('\r\n')
+                if line.startswith('0x'):
+                    words.append(int(line, 16))
+                elif line.startswith('// JOB'):
+                    fields = line.split()
+                    attributes['job_id'] = fields[-3]
+                    attributes['job_instr_count'] = int(fields[-2], 16)
+                    attributes['job_priority'] = fields[-1]
+                elif line.startswith('// Data'):
+                    fields = line.split()
+                    attributes['data_input_buffer'] = int(fields[-3], 16)
+                    attributes['data_output_buffer'] = int(fields[-2], 16)
+                    attributes['data_temp_buffer'] = int(fields[-1], 16)
+                elif line.__contains__('END'):
+                    self.jobs_parsed += 1
+                    self.parse_time += time.perf_counter() - start
+                    yield {
                         'attributes': attributes,
                         'words': words,
                     }
-                )
-                # -- Reset Variables -- #
-                attributes = dict()
-                words = list()
-            elif line.startswith('0x'):
-                words.append(line)
+                    start = time.perf_counter()
+                    # -- Reset Variables -- #
+                    attributes = dict()
+                    words = list()
+        self.parse_time += time.perf_counter() - start
+
+    def get_parse_rate(self) -> float:
+        """     Jobs parsed per second, not counting the time spent loading them.     """
+        return self.jobs_parsed / self.parse_time if self.parse_time > 0 else 0.0
 
     def load_job(self, job: dict):
 
@@ -60,7 +79,11 @@ class Loader:
         counter = 0
         for word in job['words']:
             n = self.disk.get_next_free_page()
-            while self.disk.disk[n].is_index_free(counter % 4) is False:
+            if n >= len(self.disk):
+                raise UnexpectedLoaderError(
+                    f'{self.program_file} job {pcb.job_id} does not fit, Disk has {len(self.disk)} pages.'
+                )
+            while self.disk.read_disk(n).is_index_free(counter % 4) is False:
                 counter += 1
             self.disk.write_disk(
                 page_num=n,
@@ -79,6 +102,6 @@ class Loader:
         else:
             pcb.set_disk_address_end(self.disk.get_next_free_page() - 1)
 
-    def open_program_file(self) -> list:
-        with open(self.program_file, 'r') as fh:
-            return fh.read().splitlines()
+
+class UnexpectedLoaderError(Exception):
+    pass
@@ -1,16 +1,19 @@
 import collections
 from os_.pcb import PCB
+from os_.config import statistics
 from os_.synchronization import synchronized
 from os_.sync_print import sync_print
 
 
 class MemoryMapping:
 
-    __slots__ = ['pcb_order', 'memory_map']
+    __slots__ = ['pcb_order', 'memory_map', 'queued_time', '__weakref__']
 
     def __init__(self):
         self.pcb_order = collections.deque()  # Linked List
         self.memory_map = dict()
+        # -- PCB -> statistics clock when its request was queued -- #
+        self.queued_time = dict()
 
     @synchronized
     def add_page_to_pcb(self, pcb: PCB, page_num: int):
@@ -21,6 +24,7 @@ class MemoryMapping:
             self.pcb_order.append(pcb)
             page_nums = [page_num]
             self.memory_map[pcb] = page_nums
+            self.queued_time[pcb] = statistics.clock()
 
     @synchronized
     def get_pages_for_pcb(self, pcb: PCB) -> list:
@@ -28,8 +32,23 @@ class MemoryMapping:
             raise UnexpectedMemoryMappingError('PCB not found!')
         tmp = self.memory_map[pcb]
         del self.memory_map[pcb]
+        self.queued_time.pop(pcb, None)
         return tmp
 
+    @synchronized
+    def read_pages_for_pcb(self, pcb: PCB) -> list:
+        """     The pages requested by pcb, which stays mapped until remove_from_queue(...).     """
+        if pcb not in self.memory_map:
+            raise UnexpectedMemoryMappingError('PCB not found!')
+        return list(self.memory_map[pcb])
+
+    def get_queued_time(self, pcb: PCB) -> float:
+        return self.queued_time[pcb]
+
+    def get_next_page_count(self) -> int:
+        """     Number of pages requested by the PCB get_next_pcb(...) returns.     """
+        return len(self.memory_map[self.pcb_order[0]])
+
     def contains(self, pcb: PCB) -> bool:
         return pcb in self.memory_map
 
@@ -39,6 +58,7 @@ class MemoryMapping:
             self.pcb_order.remove(pcb)
         if pcb in self.memory_map:
             del self.memory_map[pcb]
+        self.queued_time.pop(pcb, None)
 
     @synchronized
     def get_next_pcb(self) -> PCB:
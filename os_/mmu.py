@@ -1,9 +1,10 @@
+import time
 from os_.ram import RAM
 from os_.kernel import Kernel
 from os_.cache import Cache
 from os_.logical_address import LogicalAddress
 from os_.pcb import PCB
-from os_.config import WAITING_STATE
+from os_.config import READY_STATE, WAITING_STATE
 from os_.synchronization import synchronized
 from os_.sync_print import sync_print
 
@@ -13,42 +14,90 @@ MMU_DEBUG = False
 
 class MMU:
 
-    __slots__ = ['kernel', 'ram']
+    __slots__ = ['kernel', 'ram', 'write_back', 'halts', 'halt_pages', 'halt_time', 'max_halt_time', '__weakref__']
 
     def __init__(self, kernel: Kernel, ram: RAM):
         self.kernel = kernel
         self.ram = ram
+        # -- WriteBackDaemon, None leaves every dirty page to HLT -- #
+        self.write_back = None
+
+        # -- Metrics, pages written and nanoseconds spent in write_to_ram(...) -- #
+        self.halts = 0
+        self.halt_pages = 0
+        self.halt_time = 0
+        self.max_halt_time = 0
 
     @synchronized
     def check_for_interrupt(self, logical_address: LogicalAddress, cache: Cache, pcb: PCB) -> bool:
         is_interrupt = False
         page_num = logical_address.get_page_number()
         if cache.is_page_valid(logical_address=logical_address) is False:
-            if pcb.get_page_table().is_valid(page_num) is False:
+            if self.translate(pcb, page_num) is None:
                 sync_print('DEBUG: [MMU] Page Fault.') if MMU_DEBUG is True else None
                 self.kernel.add_to_page_fault_queue(pcb, page_num)
             else:
                 sync_print('DEBUG: [MMU] IO Queue.') if MMU_DEBUG is True else None
+                if page_num in pcb.prefetched_pages:
+                    self.ram.page_manager.record_prefetch_hit(pcb, page_num)
                 self.kernel.add_to_io_queue(pcb, page_num)
             pcb.set_state(WAITING_STATE)
             is_interrupt = True
         return is_interrupt
 
+    def translate(self, pcb: PCB, page_num: int) -> int:
+        """     The frame page_num of pcb is in, None if it is not in RAM, through the TLB of the CPU pcb runs on.     """
+        tlb = self.kernel.get_tlb(pcb.assigned_cpu_id)
+        if tlb is not None:
+            frame = tlb.lookup(pcb, page_num)
+            if frame is not None:
+                return frame
+        # -- A page of a queued job has a frame exactly when it is valid -- #
+        frame = pcb.get_page_table().get_page(page_num=page_num)
+        if tlb is not None and frame is not None:
+            tlb.insert(pcb, page_num, frame)
+        return frame
+
+    @synchronized
+    def preempt(self, pcb: PCB):
+        """     The time slice of pcb expired, it is READY again.     """
+        sync_print('DEBUG: [MMU] Preempted.') if MMU_DEBUG is True else None
+        pcb.set_state(READY_STATE)
+        self.kernel.requeue_pcb(pcb)
+
+    def switch_out(self, pcb: PCB):
+        """     pcb left its CPU, its dirty pages are handed to the WriteBackDaemon.     """
+        if self.write_back is not None:
+            self.write_back.switched_out(pcb)
+
     @synchronized
     def write_to_ram(self, pcb: PCB):
-        cache = pcb.cpu_state.get_cache()
-        page_table = pcb.page_table
-        for i in range(cache.CACHE_SIZE):
-            if cache.is_page_modified(index=i) and cache.is_page_valid(index=i):
-                ram_address = page_table.get_page(page_num=i)
-                self.ram.write_ram(ram_address, cache.read_page(page_num=i))
+        started = time.perf_counter_ns()
+        written = 0
+        # -- Waits for a write-back of pcb in progress -- #
+        with self.ram.page_manager.frame_lock:
+            cpu_cache = self.kernel.get_cpu_cache(pcb.cache_cpu_id)
+            if cpu_cache is not None:
+                # -- Writes back and drops the lines of pcb -- #
+                written += cpu_cache.release(pcb)
+            cache = pcb.cpu_state.get_cache()
+            for i in range(len(cache)):
+                if cache.is_page_modified(index=i) and cache.is_page_valid(index=i):
+                    ram_address = self.translate(pcb, page_num=i)
+                    self.ram.page_manager.write_page(pcb, i, ram_address, cache.read_page(page_num=i))
+                    written += 1
+        elapsed = time.perf_counter_ns() - started
+        self.halts += 1
+        self.halt_pages += written
+        self.halt_time += elapsed
+        self.max_halt_time = max(self.max_halt_time, elapsed)
 
     @staticmethod
     @synchronized
-    def read_cache(logical_address: LogicalAddress, cache: Cache) -> str:
+    def read_cache(logical_address: LogicalAddress, cache: Cache) -> int:
         return cache.read_cache(logical_address)
 
     @staticmethod
     @synchronized
-    def write_cache(logical_address: LogicalAddress, data: str, cache: Cache):
+    def write_cache(logical_address: LogicalAddress, data: int, cache: Cache):
         cache.write_cache(logical_address, data)
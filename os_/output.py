@@ -71,7 +71,10 @@ class Output:
                 else:
                     comment = None
                 if ram_page is not None:
-                    data = self.ram.read_ram(ram_page, y)
+                    if self.ram.ram[ram_page].is_index_free(y):
+                        data = None
+                    else:
+                        data = format_word(self.ram.read_ram(ram_page, y))
                     if comment is None:
                         self.ram_dump.append(f' {data}')
                     else:
@@ -89,4 +92,12 @@ class Output:
         for index in range(len(disk)):
             page = disk.read_disk(index)
             for i in range(4):
-                self.disk_dump.append(page.read_page(i))
+                if page.is_index_free(i):
+                    self.disk_dump.append(None)
+                else:
+                    self.disk_dump.append(format_word(page.read_page(i)))
+
+
+def format_word(word: int) -> str:
+    """     Formats a word the way it is written in the program file.     """
+    return f'0x{word:08X}'
@@ -1,37 +1,52 @@
-from os_.config import PAGE_SIZE, EMPTY
+from array import array
+from os_.config import PAGE_SIZE, WORD_MASK
 from os_.synchronization import synchronized
 
 
 class Page:
 
     __slots__ = [
-        'page',
+        'words',
+        'base',
         'used',
+        '__weakref__',
     ]
 
-    def __init__(self):
+    def __init__(self, words=None, base: int = 0):
         """
-            Initialize page as a list of elements.
-            Set the number of words available to the size of the page.
-            Set is_full boolean to False initially.
+            Initialize page as PAGE_SIZE native 32-bit words. A page
+            either owns its words or is a window, starting at base,
+            into the flat word buffer of RAM / Disk.
+            Set the number of words used to 0 initially.
         """
-        self.page: list = [EMPTY for i in range(PAGE_SIZE)]
+        self.words = words if words is not None else array('I', [0] * PAGE_SIZE)
+        self.base = base
         self.used = 0
 
     @synchronized
-    def write_page(self, index: int, instruction: str):
-        self.page[index] = instruction
-        self.used += 1
+    def write_page(self, index: int, instruction: int):
+        self.words[self.base + index] = instruction & WORD_MASK
+        if index >= self.used:
+            self.used = index + 1
 
-    def read_page(self, index: int) -> str:
-        return self.page[index]
+    def read_page(self, index: int) -> int:
+        return self.words[self.base + index]
+
+    def get_words(self):
+        """     The words of this page as a single slice.     """
+        return self.words[self.base:self.base + PAGE_SIZE]
+
+    def copy_from(self, page):
+        """     Copies all words of another page, array or memory-mapped, in one slice assignment.     """
+        memoryview(self.words)[self.base:self.base + PAGE_SIZE] = page.get_words()
+        self.used = page.used
 
     @synchronized
     def is_full(self) -> bool:
-        return self.used == 4
+        return self.used == PAGE_SIZE
 
     def get_words_available(self) -> int:
         return self.used
 
     def is_index_free(self, index: int) -> bool:
-        return self.page[index] == EMPTY
+        return index >= self.used
@@ -0,0 +1,166 @@
+"""
+    Content-addressed page deduplication, used when PAGE_DEDUP is True.
+
+    Once the jobs are loaded, dedup_disk(...) keys every Disk page of
+    every job on its content, keeps the first page of each content and
+    compacts the Disk down to those, so byte-identical pages of all jobs
+    share one Disk page. PCB.get_disk_address(...) maps a page of a job
+    to its Disk page.
+
+    Pages holding only instructions and input buffer words, which jobs
+    read, also share a RAM frame: a page fault on a shared Disk page
+    already in a frame maps that frame instead of loading a copy. A
+    shared frame is never evicted. Output and temp buffer pages, which
+    nearly every job writes, get frames of their own.
+
+    Writes are copy-on-write. The PageManager gives a job writing back a
+    page of a shared frame a private frame first, or a Disk page of its
+    own when RAM is full, and a dirty page evicted onto a shared Disk
+    page gets a Disk page of its own.
+"""
+import threading
+from os_.disk import Disk
+from os_.pcb import PCB
+from os_.config import PAGE_SIZE
+from os_.sync_print import sync_print
+
+PAGE_DEDUP_DEBUG = False
+
+
+class PageDedup:
+
+    __slots__ = [
+        'disk', 'lock', 'disk_refs', 'resident', 'sharers',
+        'pages_scanned', 'disk_pages', 'shared_maps', 'frames_saved', 'peak_frames_saved',
+        'frame_copies', 'disk_copies', 'disk_fallbacks',
+    ]
+
+    def __init__(self, disk: Disk):
+        self.disk = disk
+        # -- Reentrant, the PageManager holds it across a copy-on-write -- #
+        self.lock = threading.RLock()
+        # -- Disk page -> number of job pages on it -- #
+        self.disk_refs = dict()
+        # -- Disk page -> frame it is shared in -- #
+        self.resident = dict()
+        # -- Frame -> (Disk page, [(PCB, page_num) mapped to it, the first owns the frame]) -- #
+        self.sharers = dict()
+
+        # -- Metrics -- #
+        self.pages_scanned = 0
+        self.disk_pages = 0
+        self.shared_maps = 0
+        self.frames_saved = 0
+        self.peak_frames_saved = 0
+        self.frame_copies = 0
+        self.disk_copies = 0
+        self.disk_fallbacks = 0
+
+    # -------------------------- #
+    # -- Disk                 -- #
+    # -------------------------- #
+
+    def dedup_disk(self, pcbs: list):
+        """
+            Compacts the Disk pages of pcbs down to one page per content.
+            Pages are visited in Disk order, a kept page only ever moves
+            down onto a page already visited.
+        """
+        # -- (used count, words) -> Disk page, the dict hashes the content -- #
+        first = dict()
+        next_page = 0
+        for pcb in sorted(pcbs, key=lambda pcb: pcb.get_disk_address_begin()):
+            disk_pages = list()
+            for page_num in range(len(pcb.get_page_table())):
+                source = pcb.get_disk_address_begin() + page_num
+                page = self.disk.read_disk(source)
+                content = (page.used, bytes(page.get_words()))
+                target = first.get(content)
+                if target is None:
+                    target = first[content] = next_page
+                    self.disk.copy_page(source, target)
+                    next_page += 1
+                self.disk_refs[target] = self.disk_refs.get(target, 0) + 1
+                disk_pages.append(target)
+            pcb.disk_pages = disk_pages
+            self.pages_scanned += len(disk_pages)
+        self.disk.truncate(next_page)
+        self.disk_pages = next_page
+        sync_print(
+            f'DEBUG: [PageDedup] {self.pages_scanned} pages on {self.disk_pages} Disk pages.'
+        ) if PAGE_DEDUP_DEBUG is True else None
+
+    def unshare_disk_page(self, pcb: PCB, page_num: int):
+        """     Moves page_num of pcb to a Disk page of its own if its Disk page is shared.     """
+        with self.lock:
+            disk_page = pcb.get_disk_address(page_num)
+            if self.disk_refs.get(disk_page, 1) <= 1:
+                return
+            private = self.disk.get_next_free_page()
+            if private >= len(self.disk):
+                raise UnexpectedPageDedupError(f'No free Disk page left to copy page {page_num} of PID {pcb.job_id}.')
+            self.disk.increment_next_free_page()
+            self.disk_refs[disk_page] -= 1
+            self.disk_refs[private] = 1
+            pcb.disk_pages[page_num] = private
+            self.disk_copies += 1
+
+    # -------------------------- #
+    # -- RAM                  -- #
+    # -------------------------- #
+
+    def is_shareable(self, pcb: PCB, page_num: int) -> bool:
+        """     The page only holds instructions / input buffer words and its Disk page is shared.     """
+        if (page_num + 1) * PAGE_SIZE > pcb.job_size + pcb.len_input_buffer():
+            return False
+        return self.disk_refs.get(pcb.get_disk_address(page_num), 1) > 1
+
+    def share(self, pcb: PCB, page_num: int) -> int:
+        """     Maps page_num of pcb to the frame its Disk page is in, None if it is in none.     """
+        with self.lock:
+            frame = self.resident.get(pcb.get_disk_address(page_num))
+            if frame is not None:
+                self.sharers[frame][1].append((pcb, page_num))
+                self.shared_maps += 1
+                self.frames_saved += 1
+                self.peak_frames_saved = max(self.peak_frames_saved, self.frames_saved)
+            return frame
+
+    def add(self, frame: int, pcb: PCB, page_num: int):
+        """     page_num of pcb was loaded into frame, faults on the same Disk page share it.     """
+        with self.lock:
+            disk_page = pcb.get_disk_address(page_num)
+            self.resident[disk_page] = frame
+            self.sharers[frame] = (disk_page, [(pcb, page_num)])
+
+    def unmap(self, frame: int, pcb: PCB, page_num: int) -> tuple:
+        """     Unmaps page_num of pcb from frame, returns the (PCB, page_num) owning it now, None once it is free.     """
+        with self.lock:
+            entry = self.sharers.get(frame)
+            if entry is None:
+                return None
+            disk_page, mapped = entry
+            mapped.remove((pcb, page_num))
+            if mapped:
+                self.frames_saved -= 1
+                return mapped[0]
+            del self.sharers[frame]
+            if self.resident.get(disk_page) == frame:
+                del self.resident[disk_page]
+            return None
+
+    def is_resident(self, frame: int) -> bool:
+        """     frame holds a Disk page faults may share.     """
+        return frame in self.sharers
+
+    def is_shared(self, frame: int) -> bool:
+        entry = self.sharers.get(frame)
+        return entry is not None and len(entry[1]) > 1
+
+    def get_dedup_ratio(self) -> float:
+        """     Job pages per Disk page kept.     """
+        return self.pages_scanned / self.disk_pages if self.disk_pages > 0 else 0.0
+
+
+class UnexpectedPageDedupError(Exception):
+    pass
@@ -1,7 +1,24 @@
+import threading
+from contextlib import nullcontext
 from os_.ram import RAM
 from os_.disk import Disk
 from os_.pcb import PCB
 from os_.kernel import Kernel
+from os_.page import Page
+from os_.frame_allocator import FrameAllocator
+from os_.page_replacement import create_replacement_policy
+from os_.page_dedup import PageDedup
+from os_.config import (
+    READY_STATE,
+    WAITING_STATE,
+    ENDED_STATE,
+    PAGE_REPLACEMENT,
+    WORKING_SET_WINDOW,
+    READAHEAD_PAGES,
+    PAGE_DEDUP,
+    PERF_COUNTERS,
+)
+from os_.perf_counters import get_counters, now
 from os_.synchronization import synchronized
 from os_.sync_print import sync_print
 
@@ -15,7 +32,16 @@ class PageManager:
         'ram',
         'disk',
         '__is_running',
-        'free_page_pool',
+        'frames',
+        'frame_lock',
+        'replacement',
+        'dedup',
+        'evictions',
+        'refaults',
+        'write_backs',
+        'prefetches',
+        'prefetch_hits',
+        '__weakref__',
     ]
 
     def __init__(self, kernel: Kernel, ram: RAM, disk: Disk):
@@ -23,45 +49,351 @@ class PageManager:
         self.ram = ram
         self.disk = disk
         self.__is_running = True
-        self.free_page_pool = list()
+        self.frames = FrameAllocator(capacity=len(ram))
+        # -- Held while a frame of a queued job is written back or freed, -- #
+        # -- and by dispatchers marking a job RUNNING                     -- #
+        self.frame_lock = threading.Lock()
+
+        # -- Page replacement, None waits for frames to be freed -- #
+        self.replacement = None
+        if PAGE_REPLACEMENT is not None:
+            self.replacement = create_replacement_policy(
+                name=PAGE_REPLACEMENT,
+                capacity=len(ram),
+                window=WORKING_SET_WINDOW,
+            )
+        # -- Page deduplication, None gives every job pages of its own -- #
+        self.dedup = PageDedup(disk=disk) if PAGE_DEDUP is True else None
+        self.evictions = 0
+        self.refaults = 0
+        self.write_backs = 0
+        self.prefetches = 0
+        self.prefetch_hits = 0
 
-    @synchronized
     def add_page_to_pool(self, page_num: int):
-        if page_num not in self.free_page_pool:
-            self.free_page_pool.append(page_num)
+        self.frames.free(page_num)
 
-    @synchronized
     def remove_page_to_pool(self, page_num: int):
-        if page_num in self.free_page_pool:
-            self.free_page_pool.remove(page_num)
+        self.frames.reserve(page_num)
+
+    @synchronized
+    def load_page(self, pcb: PCB, page_num: int, page_data: Page) -> int:
+        """     Copies page_data into a free frame and maps page_num of pcb to it.     """
+        frame = self.frames.allocate()
+        self.ram.write_ram(address=frame, page_data=page_data)
+        pcb.get_page_table().write_page_table(page_num=page_num, ram_address=frame)
+        if self.replacement is not None:
+            self.replacement.insert(frame, pcb, page_num)
+        return frame
+
+    def load_disk_page(self, pcb: PCB, page_num: int) -> int:
+        """     Loads page_num of pcb from Disk, or maps the frame its Disk page is shared in.     """
+        page_data = self.disk.read_disk(pcb.get_disk_address(page_num))
+        if self.dedup is None or self.dedup.is_shareable(pcb, page_num) is False:
+            return self.load_page(pcb, page_num, page_data)
+        frame = self.dedup.share(pcb, page_num)
+        if frame is not None:
+            pcb.get_page_table().write_page_table(page_num=page_num, ram_address=frame)
+            return frame
+        frame = self.load_page(pcb, page_num, page_data)
+        self.dedup.add(frame, pcb, page_num)
+        return frame
+
+    def reference_frame(self, frame: int):
+        """     Called by the DMA channels, the policy is only changed under frame_lock.     """
+        if self.replacement is not None:
+            with self.frame_lock:
+                self.replacement.reference(frame)
 
     @synchronized
     def clean_page_table(self, pcb: PCB):
-        for i in range(pcb.page_table.table.__len__()):
-            ram_page = pcb.page_table.table[i]
-            if ram_page is not None:
-                self.add_page_to_pool(page_num=ram_page)
-                pcb.page_table.flip_valid(page_num=i)
+        for tlb in list(self.kernel.tlbs.values()):
+            tlb.flush(pcb)
+        for translator in list(self.kernel.translators.values()):
+            translator.invalidate(pcb.job_id)
+        with self.frame_lock:
+            for i in range(pcb.page_table.table.__len__()):
+                ram_page = pcb.page_table.table[i]
+                if ram_page is not None:
+                    if self.dedup is not None and self.unshare_frame(ram_page, pcb, i) is True:
+                        # -- Still mapped by another job -- #
+                        pcb.page_table.flip_valid(page_num=i)
+                        continue
+                    if self.replacement is not None:
+                        self.replacement.remove(ram_page)
+                    self.add_page_to_pool(page_num=ram_page)
+                    pcb.page_table.flip_valid(page_num=i)
+        self.kernel.notify_page_fault_ready()
+
+    def write_back_page(self, pcb: PCB, page_num: int) -> bool:
+        """
+            Writes a dirty cache page of pcb to its frame, False if it is
+            no longer dirty, in RAM or the job ENDED. The page is marked
+            clean before it is copied, so a CPU writing it meanwhile marks
+            it dirty again and nothing written is lost.
+        """
+        cache = pcb.cpu_state.get_cache()
+        cpu_cache = self.kernel.get_cpu_cache(pcb.cache_cpu_id)
+        # -- The CPUCache lock keeps the line from being evicted and refilled meanwhile -- #
+        with self.frame_lock, cpu_cache.lock if cpu_cache is not None else nullcontext(), \
+                self.dedup.lock if self.dedup is not None else nullcontext():
+            if pcb.get_state() == ENDED_STATE or cache.is_page_modified(index=page_num) is False or \
+                    cache.is_page_valid(index=page_num) is False:
+                return False
+            page_table = pcb.get_page_table()
+            frame = page_table.get_page(page_num=page_num)
+            if frame is None:
+                return False
+            if self.dedup is not None and self.dedup.is_shared(frame) is True:
+                # -- Copied on write at HLT or when its CPUCache line is evicted -- #
+                return False
+            cache.set_dirty_page(page_num, False)
+            if self.write_page(pcb, page_num, frame, cache.read_page(page_num=page_num)) is True:
+                page_table.set_dirty(page_num)
+        return True
+
+    def write_page(self, pcb: PCB, page_num: int, frame: int, page: Page) -> bool:
+        """     Writes a cache page of pcb to its frame, copy-on-write, False if it went to Disk instead.     """
+        if self.dedup is not None and self.dedup.is_resident(frame) is True:
+            frame = self.copy_on_write(pcb, page_num, frame, page)
+            if frame is None:
+                return False
+        self.ram.write_ram(frame, page)
+        return True
+
+    def write_to_disk(self, pcb: PCB, page_num: int, page: Page):
+        """     Writes page_num of pcb to its Disk page, copy-on-write.     """
+        if self.dedup is not None:
+            self.dedup.unshare_disk_page(pcb, page_num)
+        self.disk.write_page(pcb.get_disk_address(page_num), page)
+
+    # -------------------------- #
+    # -- Page Deduplication   -- #
+    # -------------------------- #
+
+    def copy_on_write(self, pcb: PCB, page_num: int, frame: int, page: Page) -> int:
+        """
+            Gives page_num of pcb a private copy of its shared frame and
+            returns it. With only one frame free, left to page faults,
+            page is written to a Disk page of its own instead and the
+            page unmapped, None is returned.
+        """
+        with self.dedup.lock:
+            if self.dedup.is_shared(frame) is False:
+                # -- Only pcb maps it, no fault may share it once it is written -- #
+                self.dedup.unmap(frame, pcb, page_num)
+                return frame
+            self.unshare_frame(frame, pcb, page_num)
+            for tlb in list(self.kernel.tlbs.values()):
+                tlb.shoot_down(pcb, page_num)
+            page_table = pcb.get_page_table()
+            if self.frames.__len__() < 2:
+                self.write_to_disk(pcb, page_num, page)
+                page_table.evict_page(page_num)
+                pcb.evicted_pages.add(page_num)
+                self.dedup.disk_fallbacks += 1
+                return None
+            private = self.frames.allocate()
+            self.ram.write_ram(address=private, page_data=self.ram.ram[frame])
+            page_table.write_page_table(page_num=page_num, ram_address=private)
+            if self.replacement is not None:
+                self.replacement.insert(private, pcb, page_num)
+            self.dedup.frame_copies += 1
+        sync_print(
+            f'DEBUG: [Page Manager] Copied shared frame {frame} to {private}, page {page_num} of PID {pcb.job_id}.'
+        ) if PageManagerDEBUG is True else None
+        return private
+
+    def unshare_frame(self, frame: int, pcb: PCB, page_num: int) -> bool:
+        """     Unmaps page_num of pcb from frame, True if another job still maps it.     """
+        owner = self.dedup.unmap(frame, pcb, page_num)
+        if owner is None:
+            return False
+        if self.replacement is not None and self.replacement.get_owner(frame) != owner:
+            # -- The frame stays in RAM for the job mapping it now -- #
+            self.replacement.remove(frame)
+            self.replacement.insert(frame, *owner)
+        return True
+
+    # -------------------------- #
+    # -- Page Replacement     -- #
+    # -------------------------- #
+
+    def is_evictable(self, frame: int) -> bool:
+        """
+            A frame may be evicted while its job is READY / WAITING and
+            has no IO request queued, so neither a CPU nor the DMA channel
+            is using it. Only stays true under frame_lock.
+        """
+        owner = self.replacement.get_owner(frame)
+        if owner is None:
+            return False
+        if self.dedup is not None and self.dedup.is_shared(frame) is True:
+            return False
+        pcb = owner[0]
+        if pcb.get_state() != READY_STATE and pcb.get_state() != WAITING_STATE:
+            return False
+        return self.kernel.io_queue.contains(pcb) is False
+
+    @synchronized
+    def evict_page(self) -> bool:
+        """
+            Frees the frame the replacement policy picks, False if none
+            can be evicted. The victim is picked and evicted under
+            frame_lock, which dispatchers take to mark a job RUNNING, so
+            its job can not start running in between.
+        """
+        with self.frame_lock:
+            frame = self.replacement.select_victim(self.is_evictable)
+            if frame is None:
+                return False
+            return self.evict_frame(frame)
+
+    def evict_frame(self, frame: int) -> bool:
+        """     Evicts frame, False if it was freed meanwhile. Called under frame_lock.     """
+        owner = self.replacement.get_owner(frame)
+        if owner is None:
+            return False
+        pcb, page_num = owner
+        # -- Invalidate first, the page is reloaded from Disk on its next fault -- #
+        cpu_cache = self.kernel.get_cpu_cache(pcb.cache_cpu_id)
+        if cpu_cache is not None:
+            cpu_cache.invalidate(pcb, page_num)
+        for tlb in list(self.kernel.tlbs.values()):
+            tlb.shoot_down(pcb, page_num)
+        cache = pcb.cpu_state.get_cache()
+        cache.set_valid_page(page_num, False)
+        page_table = pcb.get_page_table()
+        is_frame_dirty = page_table.is_dirty(page_num)
+        page_table.evict_page(page_num)
+        if cache.is_page_modified(index=page_num) is True:
+            self.write_to_disk(pcb, page_num, cache.read_page(page_num))
+            cache.set_dirty_page(page_num, False)
+            self.write_backs += 1
+        elif is_frame_dirty is True:
+            # -- Written back to the frame by a CPUCache or the WriteBackDaemon -- #
+            self.write_to_disk(pcb, page_num, self.ram.ram[frame])
+            self.write_backs += 1
+        if self.dedup is not None:
+            self.dedup.unmap(frame, pcb, page_num)
+        self.replacement.remove(frame)
+        self.add_page_to_pool(page_num=frame)
+        pcb.evictions += 1
+        pcb.evicted_pages.add(page_num)
+        pcb.prefetched_pages.discard(page_num)
+        self.evictions += 1
+        sync_print(
+            f'DEBUG: [Page Manager] Evicted frame {frame}, page {page_num} of PID {pcb.job_id}.'
+        ) if PageManagerDEBUG is True else None
+        return True
 
     def is_page_available(self) -> bool:
-        return self.free_page_pool.__len__() > 0
+        return self.frames.__len__() > 0
+
+    def has_serviceable_fault(self) -> bool:
+        if self.kernel.has_page_fault_jobs() is False:
+            return False
+        if self.is_page_available() is True:
+            return True
+        return self.replacement is not None and self.replacement.has_victim(self.is_evictable) is True
 
     def start_daemon(self):
         while self.__is_running is True:
-            # -- Continue Here -- #
-            if self.kernel.has_page_fault_jobs() is True and self.is_page_available() is True:
-                sync_print('DEBUG: [Page Manager] Activated!') if PageManagerDEBUG is True else None
-                pcb: PCB = self.kernel.get_job_from_page_fault_queue()
-                page_faults: list = self.kernel.get_pages_from_page_fault_queue(pcb)
-                for page_num in page_faults:
-                    pcb.page_fault_operations += 1
-                    disk_index = pcb.get_disk_address_begin() + page_num
-                    page_index = self.free_page_pool.pop(0)
-                    self.ram.write_ram(address=page_index, page_data=self.disk.read_disk(disk_index))
-                    pcb.get_page_table().write_page_table(page_num=page_num, ram_address=page_index)
+            with self.kernel.page_fault_ready:
+                self.kernel.page_fault_ready.wait_for(
+                    lambda: self.has_serviceable_fault() or not self.__is_running
+                )
+            if self.has_serviceable_fault() is True:
+                self.service_page_fault()
+
+    def service_page_fault(self) -> int:
+        """     Loads the pages of the next page fault from Disk to RAM, returns the page count, readahead included.     """
+        sync_print('DEBUG: [Page Manager] Activated!') if PageManagerDEBUG is True else None
+        started_ns = now()
+        pcb: PCB = self.kernel.get_job_from_page_fault_queue()
+        page_faults: list = self.kernel.get_pages_from_page_fault_queue(pcb)
+        if pcb.prefetched_pages:
+            # -- Faulted again before touching what was read ahead -- #
+            pcb.readahead_window = max(1, pcb.readahead_window // 2)
+        for index, page_num in enumerate(page_faults):
+            if self.is_page_available() is False and (self.replacement is None or self.evict_page() is False):
+                # -- RAM is full, the pages left wait for the next frame -- #
                 self.kernel.remove_from_page_fault_queue(pcb)
-                sync_print('DEBUG: [Page Manager] Ended!') if PageManagerDEBUG is True else None
+                for waiting_page_num in page_faults[index:]:
+                    self.kernel.add_to_page_fault_queue(pcb, waiting_page_num)
+                self.record_page_fault(started_ns, index)
+                return index
+            if pcb.get_page_table().is_valid(page_num) is True:
+                # -- Read ahead while this fault was queued -- #
+                continue
+            pcb.page_fault_operations += 1
+            if page_num in pcb.evicted_pages:
+                pcb.evicted_pages.discard(page_num)
+                pcb.refaults += 1
+                self.refaults += 1
+            with self.frame_lock:
+                self.load_disk_page(pcb, page_num)
+        self.kernel.remove_from_page_fault_queue(pcb)
+        self.record_page_fault(started_ns, len(page_faults))
+        prefetched = 0
+        if READAHEAD_PAGES > 0 and self.is_sequential(pcb, page_faults[-1]) is True:
+            prefetched = self.read_ahead(pcb, page_faults[-1])
+        sync_print('DEBUG: [Page Manager] Ended!') if PageManagerDEBUG is True else None
+        return len(page_faults) + prefetched
+
+    @staticmethod
+    def record_page_fault(started_ns: int, page_count: int):
+        """     Counts a serviced page fault, readahead not included in its latency.     """
+        if PERF_COUNTERS is True:
+            counters = get_counters()
+            counters.record_latency('page_fault_service', started_ns)
+            counters.count('page_faults_serviced')
+            counters.count('page_fault_pages', page_count)
+
+    # -------------------------- #
+    # -- Readahead            -- #
+    # -------------------------- #
+
+    @staticmethod
+    def is_sequential(pcb: PCB, page_num: int) -> bool:
+        """     The job faulted on the page right after one it has in RAM.     """
+        return page_num > 0 and pcb.get_page_table().is_valid(page_num - 1) is True
+
+    def read_ahead(self, pcb: PCB, page_num: int) -> int:
+        """
+            Loads the pages in the readahead window after page_num that
+            are not in RAM yet, as long as frames are free, and returns
+            how many. Runs after the fault was released, so the job does
+            not wait for pages it did not ask for. The job may end
+            meanwhile, every page is mapped under frame_lock, which
+            clean_page_table(...) holds, and only while the job has not
+            ENDED, so no frame is mapped into a cleaned page table.
+        """
+        page_table = pcb.get_page_table()
+        end = min(page_num + 1 + pcb.readahead_window, len(page_table))
+        loaded = 0
+        for next_page_num in range(page_num + 1, end):
+            with self.frame_lock:
+                if self.is_page_available() is False or pcb.get_state() == ENDED_STATE:
+                    break
+                if page_table.is_valid(next_page_num) is True:
+                    continue
+                self.load_disk_page(pcb, next_page_num)
+                pcb.prefetched_pages.add(next_page_num)
+                loaded += 1
+        pcb.prefetches += loaded
+        self.prefetches += loaded
+        return loaded
+
+    def record_prefetch_hit(self, pcb: PCB, page_num: int):
+        """     A job touched a page read ahead for it, one page fault saved.     """
+        pcb.prefetched_pages.discard(page_num)
+        pcb.prefetch_hits += 1
+        pcb.readahead_window = min(2 * pcb.readahead_window, READAHEAD_PAGES)
+        self.prefetch_hits += 1
 
     @synchronized
     def end_daemon(self):
         self.__is_running = False
+        with self.kernel.page_fault_ready:
+            self.kernel.page_fault_ready.notify_all()
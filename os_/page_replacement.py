@@ -0,0 +1,168 @@
+"""
+    Page replacement policies, used by the PageManager once RAM is full.
+
+    A policy tracks which job page every resident frame holds and picks
+    the frame to evict. Frames are referenced when a page is loaded from
+    Disk and when the DMA channel copies it into a cache, the only times
+    a frame of RAM is read. The PageManager decides which frames may be
+    evicted at all, see PageManager.is_evictable(...).
+
+    Victims are selected, and frames loaded by a page fault or referenced,
+    under PageManager.frame_lock. A frame referenced after it was freed
+    is no longer in owners and is ignored.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from os_.pcb import PCB
+
+
+class ReplacementPolicy(ABC):
+
+    name = None
+
+    def __init__(self, capacity: int):
+        # -- frame -> (PCB, page_num) it holds -- #
+        self.owners = dict()
+
+    def get_owner(self, frame: int) -> tuple:
+        """     The (PCB, page_num) frame holds, None once it was freed.     """
+        return self.owners.get(frame)
+
+    def insert(self, frame: int, pcb: PCB, page_num: int):
+        self.owners[frame] = (pcb, page_num)
+
+    def remove(self, frame: int):
+        self.owners.pop(frame, None)
+
+    def reference(self, frame: int):
+        pass
+
+    def has_victim(self, is_evictable) -> bool:
+        return any(is_evictable(frame) for frame in list(self.owners))
+
+    @abstractmethod
+    def select_victim(self, is_evictable) -> int:
+        pass
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}()'
+
+
+class ClockPolicy(ReplacementPolicy):
+
+    """
+        Second chance, the hand sweeps the frames and clears reference
+        bits, the first evictable frame found unreferenced is evicted.
+    """
+
+    name = 'Clock'
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.capacity = capacity
+        self.referenced = bytearray(capacity)
+        self.hand = 0
+
+    def insert(self, frame: int, pcb: PCB, page_num: int):
+        super().insert(frame, pcb, page_num)
+        self.referenced[frame] = 1
+
+    def reference(self, frame: int):
+        if frame in self.owners:
+            self.referenced[frame] = 1
+
+    def select_victim(self, is_evictable) -> int:
+        # -- Two sweeps, the first may only clear reference bits -- #
+        for _ in range(2 * self.capacity):
+            frame = self.hand
+            self.hand = (self.hand + 1) % self.capacity
+            if frame not in self.owners or is_evictable(frame) is False:
+                continue
+            if self.referenced[frame] == 1:
+                self.referenced[frame] = 0
+                continue
+            return frame
+        return None
+
+
+class LRUPolicy(ReplacementPolicy):
+
+    """     Evicts the evictable frame referenced longest ago.     """
+
+    name = 'LRU'
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        # -- frame -> time of last reference, oldest first -- #
+        self.recency = OrderedDict()
+        self.time = 0
+
+    def insert(self, frame: int, pcb: PCB, page_num: int):
+        super().insert(frame, pcb, page_num)
+        self.reference(frame)
+
+    def remove(self, frame: int):
+        super().remove(frame)
+        self.recency.pop(frame, None)
+
+    def reference(self, frame: int):
+        if frame not in self.owners:
+            return
+        self.time += 1
+        self.recency[frame] = self.time
+        self.recency.move_to_end(frame)
+
+    def select_victim(self, is_evictable) -> int:
+        for frame in list(self.recency):
+            if is_evictable(frame) is True:
+                return frame
+        return None
+
+
+class WorkingSetPolicy(LRUPolicy):
+
+    """
+        A frame not referenced in the last WORKING_SET_WINDOW references
+        is outside every working set and is evicted first, oldest first.
+        When every frame is in a working set, the job holding the most
+        evictable frames gives up its least recently used one.
+    """
+
+    name = 'WorkingSet'
+
+    def __init__(self, capacity: int, window: int):
+        super().__init__(capacity)
+        self.window = window
+
+    def select_victim(self, is_evictable) -> int:
+        resident = dict()
+        for frame, last_reference in list(self.recency.items()):
+            if is_evictable(frame) is False:
+                continue
+            if self.time - last_reference >= self.window:
+                return frame
+            owner = self.owners.get(frame)
+            if owner is None:
+                # -- Freed since recency was copied -- #
+                continue
+            pcb = owner[0]
+            if pcb not in resident:
+                resident[pcb] = [frame, 0]
+            resident[pcb][1] += 1
+        if not resident:
+            return None
+        return max(resident.values(), key=lambda oldest_and_count: oldest_and_count[1])[0]
+
+
+def create_replacement_policy(name: str, capacity: int, window: int) -> ReplacementPolicy:
+    if name == ClockPolicy.name:
+        return ClockPolicy(capacity)
+    elif name == LRUPolicy.name:
+        return LRUPolicy(capacity)
+    elif name == WorkingSetPolicy.name:
+        return WorkingSetPolicy(capacity, window)
+    raise UnexpectedReplacementPolicyError(f'Unsupported PAGE_REPLACEMENT {name}.')
+
+
+class UnexpectedReplacementPolicyError(Exception):
+    pass
@@ -4,12 +4,14 @@ from os_.sync_print import sync_print
 
 class PageTable:
 
-    __slots__ = ['page_count', 'table', 'valid_bits']
+    __slots__ = ['page_count', 'table', 'valid_bits', 'dirty_bits', '__weakref__']
 
     def __init__(self, page_count: int):
         self.page_count: int = page_count
         self.table: list = [None for i in range(page_count)]
         self.valid_bits: list = [False for i in range(page_count)]
+        # -- Frame written since it was loaded, by a CPUCache write-back -- #
+        self.dirty_bits: list = [False for i in range(page_count)]
 
     def __len__(self):
         return self.page_count
@@ -18,6 +20,7 @@ class PageTable:
     def write_page_table(self, page_num: int, ram_address: int):
         self.table[page_num] = ram_address
         self.valid_bits[page_num] = True
+        self.dirty_bits[page_num] = False
 
     def read_page_table(self) -> list:
         return self.table
@@ -30,6 +33,18 @@ class PageTable:
     def is_valid(self, page_num: int) -> bool:
         return self.valid_bits[page_num]
 
+    def set_dirty(self, page_num: int):
+        self.dirty_bits[page_num] = True
+
+    def is_dirty(self, page_num: int) -> bool:
+        return self.dirty_bits[page_num]
+
+    @synchronized
+    def evict_page(self, page_num: int):
+        self.table[page_num] = None
+        self.valid_bits[page_num] = False
+        self.dirty_bits[page_num] = False
+
     @synchronized
     def flip_valid(self, page_num: int):
         self.valid_bits[page_num] = not self.valid_bits[page_num]
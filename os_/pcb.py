@@ -1,8 +1,8 @@
 from os_.page_table import PageTable
 from os_.page import Page
 from os_.cpu_state import CPUState
+from os_.cache import Cache
 from os_.config import (
-    SCHEDULING_TYPE,
     NEW_STATE,
     PAGE_SIZE,
     statistics,
@@ -18,9 +18,13 @@ class PCB:
     __slots__ = [
         'job_id', 'job_size', 'priority', 'page_table',
         'input_buffer', 'output_buffer', 'temp_buffer', 'state',
-        'cpu_state', 'disk_address_begin', 'disk_address_end', 'assigned_cpu_id',
+        'cpu_state', 'disk_address_begin', 'disk_address_end', 'disk_pages', 'assigned_cpu_id',
         'timer', 'waiting_time', 'running_time', 'io_operations', 'percent_ram_used',
-        'page_fault_operations',
+        'page_fault_operations', 'arrival_time', 'turnaround_time',
+        'evictions', 'refaults', 'evicted_pages',
+        'readahead_window', 'prefetched_pages', 'prefetches', 'prefetch_hits',
+        'cache_cpu_id', 'cache_hits', 'cache_misses', 'cache_evictions', 'steals',
+        '__weakref__',
     ]
 
     def __init__(self, job_id: str, job_size: int, priority: int):
@@ -39,10 +43,15 @@ class PCB:
         self.cpu_state = CPUState()
         self.disk_address_begin = 0
         self.disk_address_end = None
+        # -- Disk page of every page, set by PageDedup, None while they are contiguous -- #
+        self.disk_pages = None
 
         # -- CPU ID Persistence -- #
         self.assigned_cpu_id = None
 
+        # -- CPU whose CPUCache holds the lines of this job -- #
+        self.cache_cpu_id = None
+
         # -- Stats -- #
         self.timer = 0.0
         self.waiting_time = 0.0
@@ -50,6 +59,19 @@ class PCB:
         self.io_operations = 0
         self.page_fault_operations = 0
         self.percent_ram_used = 0.0
+        self.arrival_time = 0.0
+        self.turnaround_time = 0.0
+        self.evictions = 0
+        self.refaults = 0
+        self.evicted_pages = set()
+        self.readahead_window = 1
+        self.prefetched_pages = set()
+        self.prefetches = 0
+        self.prefetch_hits = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self.steals = 0
 
     def __hash__(self):
         """
@@ -58,15 +80,6 @@ class PCB:
         """
         return hash(f'{self.job_id},{self.job_size},{self.priority}')
 
-    def __lt__(self, other) -> bool:
-        """     Implements Less Then or Equal to on a Python PCB Object     """
-        if SCHEDULING_TYPE == 'SJF':
-            return self.job_size < other.job_size
-        elif SCHEDULING_TYPE == 'Priority':
-            return self.priority < other.priority
-        elif SCHEDULING_TYPE == 'FIFO':
-            return self.job_id < other.job_id
-
     def __eq__(self, other) -> bool:
         """     Implements Equal to on a Python PCB Object     """
         return self.job_id == other.job_id
@@ -153,6 +166,7 @@ class PCB:
         if word_count % 4 > 0:
             page_count += 1
         self.page_table = PageTable(page_count=page_count)
+        self.cpu_state.set_cache(Cache(page_count=page_count))
 
     # ---------- #
     # -- DISK -- #
@@ -164,6 +178,12 @@ class PCB:
     def get_disk_address_end(self) -> int:
         return self.disk_address_end
 
+    def get_disk_address(self, page_num: int) -> int:
+        """     The Disk page page_num of the job is on.     """
+        if self.disk_pages is not None:
+            return self.disk_pages[page_num]
+        return self.disk_address_begin + page_num
+
     def set_disk_address_begin(self, address: int):
         self.disk_address_begin = address
 
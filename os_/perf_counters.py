@@ -0,0 +1,130 @@
+"""
+    Performance counters, used when PERF_COUNTERS is True.
+
+    Every thread counts into a PerfCounters of its own, found through a
+    threading.local, so counting never takes a lock. Latencies are host
+    nanoseconds from time.perf_counter_ns, in the event driver as well.
+    Queue depths are sampled whenever a request is queued.
+
+    A CPU keeps its own counters, instructions retired per opcode class,
+    fetches, interrupts and context switches, in plain attributes that
+    its thread alone writes. get_report(...) reads those and sums the
+    counters of every thread once the run is over, export_json(...)
+    writes the result next to the dumps.
+"""
+import json
+import threading
+import time
+from os_.config import PERF_COUNTERS
+
+# -- Opcode classes, by instruction format -- #
+OPCODE_CLASSES = ['Arithmetic', 'Branch / Immediate', 'Jump', 'IO']
+
+
+class PerfCounters:
+
+    __slots__ = ['thread_name', 'counts', 'latencies', 'depths']
+
+    def __init__(self, thread_name: str):
+        self.thread_name = thread_name
+        # -- name -> count -- #
+        self.counts = dict()
+        # -- name -> [samples, total ns, max ns] -- #
+        self.latencies = dict()
+        # -- name -> [samples, total depth, max depth] -- #
+        self.depths = dict()
+
+    def count(self, name: str, n: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def record_latency(self, name: str, started_ns: int):
+        """     Records the nanoseconds since started_ns, a time.perf_counter_ns() reading.     """
+        add_sample(self.latencies, name, time.perf_counter_ns() - started_ns)
+
+    def sample_depth(self, name: str, depth: int):
+        add_sample(self.depths, name, depth)
+
+
+def add_sample(samples: dict, name: str, value: int):
+    sample = samples.get(name)
+    if sample is None:
+        samples[name] = [1, value, value]
+        return
+    sample[0] += 1
+    sample[1] += value
+    if value > sample[2]:
+        sample[2] = value
+
+
+THREAD_COUNTERS = list()
+REGISTRY_LOCK = threading.Lock()
+LOCAL = threading.local()
+
+
+def get_counters() -> PerfCounters:
+    """     The PerfCounters of the calling thread, created on first use.     """
+    try:
+        return LOCAL.counters
+    except AttributeError:
+        pass
+    counters = LOCAL.counters = PerfCounters(thread_name=threading.current_thread().name)
+    with REGISTRY_LOCK:
+        THREAD_COUNTERS.append(counters)
+    return counters
+
+
+def now() -> int:
+    """     A perf_counter_ns() reading to time a service with, 0 with PERF_COUNTERS off.     """
+    return time.perf_counter_ns() if PERF_COUNTERS is True else 0
+
+
+def get_report(cpus: list) -> dict:
+    """     Per CPU counters, and the counters of every thread summed.     """
+    counts = dict()
+    latencies = dict()
+    depths = dict()
+    with REGISTRY_LOCK:
+        thread_counters = list(THREAD_COUNTERS)
+    for counters in thread_counters:
+        for name, n in counters.counts.items():
+            counts[name] = counts.get(name, 0) + n
+        merge(latencies, counters.latencies)
+        merge(depths, counters.depths)
+    return {
+        'cpus': [
+            {
+                'cpu_id': cpu.cpu_id,
+                'instructions_retired': cpu.instructions_executed,
+                'instructions_by_opcode_class': dict(zip(OPCODE_CLASSES, cpu.format_counts)),
+                'fetches': cpu.fetches,
+                'interrupts': cpu.interrupts,
+                'context_switches': cpu.context_switches,
+                'jobs_completed': cpu.jobs_completed,
+            }
+            for cpu in cpus
+        ],
+        'counts': counts,
+        'latencies_ns': {
+            name: {'samples': n, 'mean': total / n, 'max': maximum}
+            for name, (n, total, maximum) in latencies.items()
+        },
+        'queue_depths': {
+            name: {'samples': n, 'mean': total / n, 'max': maximum}
+            for name, (n, total, maximum) in depths.items()
+        },
+        'threads': len(thread_counters),
+    }
+
+
+def merge(totals: dict, samples: dict):
+    for name, (n, total, maximum) in list(samples.items()):
+        previous = totals.get(name)
+        if previous is None:
+            totals[name] = [n, total, maximum]
+        else:
+            totals[name] = [previous[0] + n, previous[1] + total, max(previous[2], maximum)]
+
+
+def export_json(path: str, report: dict):
+    with open(path, 'w') as fh:
+        json.dump(report, fh, indent=2)
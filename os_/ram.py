@@ -1,3 +1,4 @@
+from array import array
 from os_.page import Page
 from os_.config import PAGE_SIZE
 from os_.synchronization import synchronized
@@ -8,15 +9,19 @@ class RAM:
 
     __slots__ = [
         'ram',
+        'words',
         'jobs_on_ram',
         'page_manager',
+        '__weakref__',
     ]
 
     DEFAULT_CAPACITY = 2 ** 10 // 4  # 1024 words
 
     def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        # -- One flat buffer of 32-bit words, pages are windows into it -- #
+        self.words = array('I', [0] * (capacity * PAGE_SIZE))
         self.ram: list = [
-            Page()
+            Page(words=self.words, base=i * PAGE_SIZE)
             for i in range(capacity)
         ]
         self.jobs_on_ram = 0
@@ -32,14 +37,10 @@ class RAM:
 
     @synchronized
     def write_ram(self, address: int, page_data: Page):
-        for i in range(PAGE_SIZE):
-            self.ram[address].write_page(
-                index=i,
-                instruction=page_data.read_page(i)
-            )
+        self.ram[address].copy_from(page_data)
         self.page_manager.remove_page_to_pool(address)
 
-    def read_ram(self, ram_address: int, page_address: int) -> str:
+    def read_ram(self, ram_address: int, page_address: int) -> int:
         return self.ram[ram_address].read_page(page_address)
 
     # -- Testing / Experimental -- #
@@ -0,0 +1,88 @@
+"""
+    Scheduling policies order the Kernel's PCBs.
+
+    A policy turns a PCB into an integer key once, when the PCB is
+    queued or the policy is switched, and the Kernel keeps PCBs in
+    heaps of (key, load order). Lower keys are dispatched first,
+    equal keys in the order the jobs were loaded.
+"""
+from abc import ABC, abstractmethod
+from os_.pcb import PCB
+
+
+class SchedulingPolicy(ABC):
+
+    name = None
+
+    @abstractmethod
+    def key(self, pcb: PCB) -> int:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}()'
+
+
+class LoadOrderPolicy(SchedulingPolicy):
+
+    """     Jobs in the order they were loaded, the Kernel's default.     """
+
+    name = 'Load'
+
+    def key(self, pcb: PCB) -> int:
+        return 0
+
+
+class RoundRobinPolicy(SchedulingPolicy):
+
+    """
+        Every job has the same key, so a job preempted by
+        TIME_QUANTUM is requeued behind all the others.
+    """
+
+    name = 'RR'
+
+    def key(self, pcb: PCB) -> int:
+        return 0
+
+
+class FIFOPolicy(SchedulingPolicy):
+
+    name = 'FIFO'
+
+    def key(self, pcb: PCB) -> int:
+        return int(pcb.job_id, 16)
+
+
+class PriorityPolicy(SchedulingPolicy):
+
+    name = 'Priority'
+
+    def key(self, pcb: PCB) -> int:
+        return int(pcb.priority, 16)
+
+
+class ShortestJobFirstPolicy(SchedulingPolicy):
+
+    name = 'SJF'
+
+    def key(self, pcb: PCB) -> int:
+        return pcb.job_size
+
+
+POLICIES = {
+    policy.name: policy
+    for policy in [
+        LoadOrderPolicy(), RoundRobinPolicy(), FIFOPolicy(), PriorityPolicy(), ShortestJobFirstPolicy(),
+    ]
+}
+
+
+def get_policy(name: str) -> SchedulingPolicy:
+    try:
+        return POLICIES[name]
+    except KeyError:
+        raise UnexpectedSchedulingPolicyError(f'Unsupported SCHEDULING_TYPE {name}.') from None
+
+
+class UnexpectedSchedulingPolicyError(Exception):
+    pass
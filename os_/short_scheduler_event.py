@@ -0,0 +1,179 @@
+"""
+    Event driven ShortScheduler, used when DRIVER_MODE = 'Event'.
+
+    The dispatchers, CPUs, DMA channel, Page Manager and write-back
+    daemon run as generators on one EventEngine, so no thread is
+    started and the same job file always gives the same dumps and
+    statistics. Time is counted in ticks, see IO_PAGE_TICKS and
+    PAGE_FAULT_TICKS, a page written back costs IO_PAGE_TICKS.
+
+    A CPU runs ahead of the clock until the next pending event is
+    due, which is safe since nothing else can happen before it.
+    The DMA channel and Page Manager take their cost before they
+    service a request, so a job only becomes ready once its pages
+    have arrived.
+"""
+from os_.ram import RAM
+from os_.kernel import Kernel
+from os_.page_manager import PageManager
+from os_.pcb import PCB
+from os_.config import (
+    CPU_COUNT,
+    DMA_CHANNELS,
+    READY_STATE,
+    RUNNING_STATE,
+    WAITING_STATE,
+    ENDED_STATE,
+    IO_PAGE_TICKS,
+    PAGE_FAULT_TICKS,
+    WRITE_BACK_THRESHOLD,
+    WRITE_BACK_INTERVAL,
+    CORE_DUMPS,
+    statistics,
+)
+from os_.dma import DMAChannel
+from os_.mmu import MMU
+from os_.write_back import WriteBackDaemon
+from os_.cpu import CPU
+from os_.event_engine import EventEngine, WAIT
+
+
+class EventScheduler:
+
+    def __init__(self, ram: RAM, kernel: Kernel, page_manager: PageManager):
+        self.ram = ram
+        self.kernel = kernel
+        self.dma_channels = [
+            DMAChannel(ram=self.ram, kernel=self.kernel, channel_id=i)
+            for i in range(1, DMA_CHANNELS + 1)
+        ]
+        self.page_manager = page_manager
+        self.mmu = MMU(kernel=self.kernel, ram=self.ram)
+
+        self.engine = EventEngine()
+        self.slice_ticks = 0
+        statistics.clock = self.get_time
+
+        # -- Created on the simulated clock -- #
+        self.write_back = None
+        if WRITE_BACK_THRESHOLD > 0 or WRITE_BACK_INTERVAL > 0:
+            self.write_back = WriteBackDaemon(
+                kernel=self.kernel,
+                page_manager=self.page_manager,
+                threshold=WRITE_BACK_THRESHOLD,
+                interval=WRITE_BACK_INTERVAL,
+            )
+            self.mmu.write_back = self.write_back
+
+        self.cpu_bank = list()
+        id_num_offset = 1
+        for i in range(id_num_offset, CPU_COUNT + id_num_offset):
+            self.cpu_bank.append(CPU(id_=i, mmu=self.mmu))
+
+    def get_time(self) -> int:
+        """     The simulated clock, including the ticks a CPU ran ahead.     """
+        return self.engine.get_time() + self.slice_ticks
+
+    def run(self):
+        for cpu in self.cpu_bank:
+            self.engine.spawn(self.dispatcher(cpu))
+        for dma in self.dma_channels:
+            self.engine.spawn(self.dma_daemon(dma))
+        self.engine.spawn(self.page_manager_daemon())
+        if self.write_back is not None:
+            self.engine.spawn(self.write_back_daemon())
+        self.engine.run()
+        if self.kernel.get_queue_size() > 0:
+            raise UnexpectedEventSchedulerError(
+                f'No event left at tick {self.engine.get_time()} with '
+                f'{self.kernel.get_queue_size()} jobs in the queue.'
+            )
+
+    def dispatcher(self, cpu: CPU):
+        while self.kernel.get_queue_size() > 0:
+            next_job = self.kernel.get_next_pcb(cpu_id=cpu.cpu_id)
+
+            if next_job is None:
+                yield WAIT
+                continue
+
+            next_job.assigned_cpu_id = cpu.cpu_id
+
+            if next_job.get_state() == READY_STATE:
+                next_job.set_state(RUNNING_STATE)
+                yield from self.run_pcb(cpu, next_job)
+                self.engine.notify()
+
+            elif next_job.get_state() == WAITING_STATE:
+                if not self.kernel.io_queue.contains(next_job) and \
+                        not self.kernel.page_fault_queue.contains(pcb=next_job):
+                    next_job.set_state(READY_STATE)
+                else:
+                    yield WAIT
+
+            elif next_job.get_state() == ENDED_STATE:
+                CORE_DUMPS.add_to_ram_dump(pcb=next_job, cpu_id=cpu.cpu_id)
+                statistics.process_percentage_ram_used(
+                    pcb=next_job,
+                    pages_in_ram=len(self.ram)
+                )
+                statistics.save_to_report(pcb=next_job)
+                self.page_manager.clean_page_table(pcb=next_job)
+                self.kernel.remove_pcb(next_job)
+                self.engine.notify()
+
+    def run_pcb(self, cpu: CPU, pcb: PCB):
+        """     Runs pcb until it is interrupted or halts, one tick per step.     """
+        cpu.current_pcb = pcb
+        cpu.initialize_cpu()
+        cpu.is_spinning = True
+        while cpu.is_spinning is True:
+            budget = self.engine.next_event_time() - self.engine.get_time()
+            ticks = 0
+            while cpu.is_spinning is True and (ticks < budget or ticks == 0):
+                ticks += 1
+                self.slice_ticks = ticks
+                cpu.step()
+            self.slice_ticks = 0
+            cpu.busy_time += ticks
+            yield ticks
+        cpu.account_cache()
+        self.mmu.switch_out(pcb)
+
+    def dma_daemon(self, dma: DMAChannel):
+        while True:
+            pcb = dma.claim_io_request()
+            if pcb is None:
+                yield WAIT
+                continue
+            ticks = len(self.kernel.read_pages_from_io_queue(pcb)) * IO_PAGE_TICKS
+            dma.busy_time += ticks
+            yield ticks
+            dma.transfer(pcb)
+            self.engine.notify()
+
+    def page_manager_daemon(self):
+        while True:
+            if self.page_manager.has_serviceable_fault() is False:
+                yield WAIT
+                continue
+            page_count = self.kernel.get_next_page_fault_page_count()
+            yield page_count * PAGE_FAULT_TICKS
+            loaded = self.page_manager.service_page_fault()
+            self.engine.notify()
+            if loaded > page_count:
+                # -- Readahead keeps the Page Manager busy after the job was released -- #
+                yield (loaded - page_count) * PAGE_FAULT_TICKS
+
+    def write_back_daemon(self):
+        """     Woken whenever a job leaves a CPU, sweeps on the first wake up after each interval.     """
+        while True:
+            written = self.write_back.service()
+            if written == 0:
+                yield WAIT
+                continue
+            yield written * IO_PAGE_TICKS
+
+
+class UnexpectedEventSchedulerError(Exception):
+    pass
@@ -2,10 +2,12 @@ import threading
 from os_.ram import RAM
 from os_.kernel import Kernel
 from os_.page_manager import PageManager
-from os_.config import CPU_COUNT, READY_STATE, RUNNING_STATE, WAITING_STATE, ENDED_STATE, CORE_DUMPS, statistics
+from os_.config import CPU_COUNT, DMA_CHANNELS, WRITE_BACK_THRESHOLD, WRITE_BACK_INTERVAL, READY_STATE, RUNNING_STATE, WAITING_STATE, ENDED_STATE, CORE_DUMPS, statistics
 from os_.dma import DMAChannel
 from os_.mmu import MMU
+from os_.write_back import WriteBackDaemon
 from os_.cpu import CPU
+from os_.cpu_bank import create_cpu
 
 
 class ShortScheduler:
@@ -14,18 +16,32 @@ class ShortScheduler:
         self.ram = ram
         self.kernel = kernel
 
-        self.dma = DMAChannel(ram=self.ram, kernel=self.kernel)
-        threading.Thread(target=self.dma.start_daemon, args=(), daemon=True).start()
+        self.dma_channels = list()
+        for i in range(1, DMA_CHANNELS + 1):
+            dma = DMAChannel(ram=self.ram, kernel=self.kernel, channel_id=i)
+            self.dma_channels.append(dma)
+            threading.Thread(target=dma.start_daemon, args=(), daemon=True).start()
 
         self.page_manager = page_manager
         threading.Thread(target=self.page_manager.start_daemon, args=(), daemon=True).start()
 
         self.mmu = MMU(kernel=self.kernel, ram=self.ram)
 
+        self.write_back = None
+        if WRITE_BACK_THRESHOLD > 0 or WRITE_BACK_INTERVAL > 0:
+            self.write_back = WriteBackDaemon(
+                kernel=self.kernel,
+                page_manager=self.page_manager,
+                threshold=WRITE_BACK_THRESHOLD,
+                interval=WRITE_BACK_INTERVAL,
+            )
+            self.mmu.write_back = self.write_back
+            threading.Thread(target=self.write_back.start_daemon, args=(), daemon=True).start()
+
         self.cpu_bank = list()
         id_num_offset = 1
         for i in range(id_num_offset, CPU_COUNT + id_num_offset):
-            cpu = CPU(id_=i, mmu=self.mmu)
+            cpu = create_cpu(id_=i, mmu=self.mmu)
             self.cpu_bank.append(cpu)
             threading.Thread(target=cpu.run, args=(), daemon=True).start()
 
@@ -40,28 +56,37 @@ class ShortScheduler:
             thread.join()
 
         self.page_manager.end_daemon()
-        self.dma.end_daemon()
+        for dma in self.dma_channels:
+            dma.end_daemon()
+        if self.write_back is not None:
+            self.write_back.end_daemon()
 
     def dispatcher(self, cpu: CPU):
         while self.kernel.get_queue_size() > 0:
+            generation = self.kernel.get_dispatch_generation()
             next_job = self.kernel.get_next_pcb(cpu_id=cpu.cpu_id)
 
             if next_job is None:
+                self.kernel.wait_for_dispatch_event(generation)
                 continue
 
             next_job.assigned_cpu_id = cpu.cpu_id
 
-            while cpu.is_process_running():
-                pass
+            cpu.wait_until_idle()
 
             if next_job.get_state() == READY_STATE:
-                next_job.set_state(RUNNING_STATE)
+                # -- Not while the PageManager picks and evicts a victim, see evict_page() -- #
+                with self.page_manager.frame_lock:
+                    next_job.set_state(RUNNING_STATE)
                 cpu.run_pcb(next_job)
 
             elif next_job.get_state() == WAITING_STATE:
                 if not self.kernel.io_queue.contains(next_job) and \
                         not self.kernel.page_fault_queue.contains(pcb=next_job):
                     next_job.set_state(READY_STATE)
+                else:
+                    # -- blocks until the DMA / Page Manager finish a job -- #
+                    self.kernel.wait_for_dispatch_event(generation)
 
             elif next_job.get_state() == ENDED_STATE:
                 CORE_DUMPS.add_to_ram_dump(pcb=next_job, cpu_id=cpu.cpu_id)
@@ -71,4 +96,4 @@ class ShortScheduler:
                 )
                 statistics.save_to_report(pcb=next_job)
                 self.page_manager.clean_page_table(pcb=next_job)
-                self.kernel.pcb_queue.remove(next_job)
+                self.kernel.remove_pcb(next_job)
@@ -1,3 +1,4 @@
+import math
 import time
 from os_.config import (
     NEW_STATE, READY_STATE, RUNNING_STATE, WAITING_STATE, ENDED_STATE,
@@ -15,33 +16,44 @@ class PCBStateMixin:
             self.waiting_to_ready(pcb)
         elif old_state == RUNNING_STATE and new_state == ENDED_STATE:
             self.running_to_ended(pcb)
+        elif old_state == RUNNING_STATE and new_state == READY_STATE:
+            self.running_to_ready(pcb)
         elif old_state is None and new_state == NEW_STATE:
             # -- No stats here -- #
             pass
         elif old_state == NEW_STATE and new_state == READY_STATE:
-            # -- No stats here -- #
-            pass
+            self.new_to_ready(pcb)
         else:
             # -- Unexpected State -- #
             raise TypeError(f'[Statistics] Unexpected STATE change {old_state} -> {new_state}!')
 
+    def new_to_ready(self, pcb):
+        pcb.arrival_time = self.clock()
+
     def ready_to_running(self, pcb):
-        pcb.timer = time.time()
+        pcb.timer = self.clock()
 
     def running_to_waiting(self, pcb):
-        time_ran = time.time() - pcb.timer
+        time_ran = self.clock() - pcb.timer
         pcb.running_time += time_ran
-        pcb.timer = time.time()
+        pcb.timer = self.clock()
 
     def waiting_to_ready(self, pcb):
-        waiting_time = time.time() - pcb.timer
+        waiting_time = self.clock() - pcb.timer
         pcb.waiting_time += waiting_time
-        pcb.timer = time.time()
+        pcb.timer = self.clock()
+
+    def running_to_ready(self, pcb):
+        # -- Preempted at the end of its time slice -- #
+        time_ran = self.clock() - pcb.timer
+        pcb.running_time += time_ran
+        pcb.timer = self.clock()
 
     def running_to_ended(self, pcb):
-        time_ran = time.time() - pcb.timer
+        time_ran = self.clock() - pcb.timer
         pcb.running_time += time_ran
         pcb.timer = None
+        pcb.turnaround_time = self.clock() - pcb.arrival_time
 
 
 class PercentageRAMUsedMixin:
@@ -59,7 +71,11 @@ class PercentageRAMUsedMixin:
 class Statistics(PCBStateMixin, PercentageRAMUsedMixin):
 
     def __init__(self):
+        # -- Wall clock, the event driver swaps in its simulated clock -- #
+        self.clock = time.time
         self.report = list()
+        self.cpu_report = list()
+        self.turnaround_times = list()
         self.report.append([
             'JOB_ID',
             'CPU_ID',
@@ -69,6 +85,19 @@ class Statistics(PCBStateMixin, PercentageRAMUsedMixin):
             'IO Operations',
             'Page Faults',
             'Ram used (%)',
+            'Evictions',
+            'Refaults',
+            'Prefetch Accuracy (%)',
+            'Faults Saved',
+            'Cache Hit Rate (%)',
+            'Cache Evictions',
+            'Times Stolen',
+        ])
+        self.cpu_report.append([
+            'CPU_ID',
+            'Jobs Completed',
+            'Utilization (%)',
+            'Jobs Stolen',
         ])
 
     def save_to_report(self, pcb):
@@ -81,8 +110,39 @@ class Statistics(PCBStateMixin, PercentageRAMUsedMixin):
             pcb.io_operations,
             pcb.page_fault_operations,
             round(pcb.percent_ram_used * 100, ndigits=2),
+            pcb.evictions,
+            pcb.refaults,
+            round(pcb.prefetch_hits / pcb.prefetches * 100 if pcb.prefetches > 0 else 0.0, ndigits=2),
+            pcb.prefetch_hits,
+            round(get_hit_rate(pcb.cache_hits, pcb.cache_misses) * 100, ndigits=2),
+            pcb.cache_evictions,
+            pcb.steals,
         ])
+        self.turnaround_times.append(pcb.turnaround_time)
+
+    def save_cpu_to_report(self, cpu, elapsed: float, steals: int):
+        """     Busy time of cpu over elapsed, both on the statistics clock.     """
+        self.cpu_report.append([
+            cpu.cpu_id,
+            cpu.jobs_completed,
+            round(cpu.busy_time / elapsed * 100 if elapsed > 0 else 0.0, ndigits=2),
+            steals,
+        ])
+
+    def get_turnaround_summary(self) -> tuple:
+        """     Mean and p95 (nearest rank) time from READY to ENDED.     """
+        if not self.turnaround_times:
+            return 0.0, 0.0
+        times = sorted(self.turnaround_times)
+        p95 = times[math.ceil(0.95 * len(times)) - 1]
+        return sum(times) / len(times), p95
 
     def print_report(self):
         for line in self.report:
             print(','.join([str(i) for i in line]))
+        for line in self.cpu_report:
+            print(','.join([str(i) for i in line]))
+
+
+def get_hit_rate(hits: int, misses: int) -> float:
+    return hits / (hits + misses) if hits + misses > 0 else 0.0
@@ -1,14 +1,182 @@
+"""
+    @synchronized wraps a function or method in a lock. Every
+    decorated function is a lock site, named by its __qualname__.
+
+    LOCK_MODE picks how a site hands out locks to methods
+    -- Function   one lock for the site, shared by every instance
+    -- Instance   one lock per instance, per site
+    -- Striped    LOCK_STRIPES locks per site, an instance hashes to one
+    -- None       no locks, for the single threaded event driver
+    Plain functions and static methods always use one lock per site.
+    The mode is read when a function is decorated, i.e. on import.
+
+    An Instance lock is dropped when its instance is collected, so a
+    class with __slots__ lists '__weakref__'. Its counts stay in the
+    totals of the site.
+
+    With LOCK_STATISTICS every lock counts its acquisitions, the ones
+    that had to wait for another thread and the time spent waiting.
+"""
 import threading
 import functools
+import inspect
+import time
+import weakref
+
+# ---------------------- #
+# -- Lock Mode
+# -- Function
+# -- Instance
+# -- Striped
+# -- None
+# ---------------------- #
+
+LOCK_MODE = 'Instance'
+
+LOCK_STRIPES = 16
+
+LOCK_STATISTICS = True
+
+LOCK_SITES = list()
+
+
+class SiteLock:
+
+    __slots__ = ['lock', 'acquisitions', 'contended', 'wait_ns']
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_ns = 0
+
+    def __enter__(self):
+        if LOCK_STATISTICS is False:
+            self.lock.acquire()
+            return
+        # -- Counters are only updated while the lock is held -- #
+        if self.lock.acquire(blocking=False) is False:
+            start = time.perf_counter_ns()
+            self.lock.acquire()
+            self.wait_ns += time.perf_counter_ns() - start
+            self.contended += 1
+        self.acquisitions += 1
+
+    def __exit__(self, *args):
+        self.lock.release()
+
+
+class LockSite:
+
+    __slots__ = ['name', 'locks', 'guard', 'retired']
+
+    def __init__(self, name: str):
+        self.name = name
+        self.locks = dict()
+        # -- Reentrant, a collection inside get_lock(...) may retire a lock -- #
+        self.guard = threading.RLock()
+        # -- (acquisitions, contended, wait_ns) of the locks of collected instances -- #
+        self.retired = (0, 0, 0)
+
+    def get_lock(self, key: int, owner=None) -> SiteLock:
+        """     The lock at key, one created for owner is retired once owner is collected.     """
+        try:
+            return self.locks[key]
+        except KeyError:
+            pass
+        with self.guard:
+            lock = self.locks.get(key)
+            if lock is None:
+                lock = self.locks[key] = SiteLock()
+                if owner is not None:
+                    weakref.finalize(owner, self.retire_lock, key).atexit = False
+            return lock
+
+    def retire_lock(self, key: int):
+        with self.guard:
+            lock = self.locks.pop(key, None)
+            if lock is not None:
+                acquisitions, contended, wait_ns = self.retired
+                self.retired = (
+                    acquisitions + lock.acquisitions,
+                    contended + lock.contended,
+                    wait_ns + lock.wait_ns,
+                )
+
+    def get_totals(self) -> tuple:
+        """     Returns (acquisitions, contended, wait_ns) over all locks of the site.     """
+        with self.guard:
+            locks = list(self.locks.values())
+            acquisitions, contended, wait_ns = self.retired
+        return (
+            acquisitions + sum(lock.acquisitions for lock in locks),
+            contended + sum(lock.contended for lock in locks),
+            wait_ns + sum(lock.wait_ns for lock in locks),
+        )
 
 
 def synchronized(wrapped):
 
-    lock = threading.Lock()
+    if LOCK_MODE == 'None':
+        return wrapped
+
+    site = LockSite(name=wrapped.__qualname__)
+    LOCK_SITES.append(site)
+
+    if LOCK_MODE == 'Function' or is_method(wrapped) is False:
+        lock = site.get_lock(key=0)
+
+        @functools.wraps(wrapped)
+        def _wrap(*args, **kwargs):
+            with lock:
+                return wrapped(*args, **kwargs)
+
+    elif LOCK_MODE == 'Instance':
+
+        # -- Keyed by id, the lock is retired before the id can be reused -- #
+        @functools.wraps(wrapped)
+        def _wrap(self, *args, **kwargs):
+            with site.get_lock(key=id(self), owner=self):
+                return wrapped(self, *args, **kwargs)
 
-    @functools.wraps(wrapped)
-    def _wrap(*args, **kwargs):
-        with lock:
-            return wrapped(*args, **kwargs)
+    elif LOCK_MODE == 'Striped':
+
+        @functools.wraps(wrapped)
+        def _wrap(self, *args, **kwargs):
+            with site.get_lock(key=(id(self) >> 4) % LOCK_STRIPES):
+                return wrapped(self, *args, **kwargs)
+
+    else:
+        raise UnexpectedSynchronizationError(f'Unsupported LOCK_MODE {LOCK_MODE}.')
 
     return _wrap
+
+
+def is_method(wrapped) -> bool:
+    parameters = list(inspect.signature(wrapped).parameters)
+    return len(parameters) > 0 and parameters[0] == 'self'
+
+
+def lock_report(by_class: bool = True) -> list:
+    """
+        Returns [(name, acquisitions, contended, wait_ns), ...] for
+        every lock site that was used, or rolled up per class, with
+        the longest waits first.
+    """
+    report = dict()
+    for site in LOCK_SITES:
+        name = site.name.split('.')[0] if by_class is True else site.name
+        totals = site.get_totals()
+        if totals[0] == 0:
+            continue
+        previous = report.get(name, (0, 0, 0))
+        report[name] = tuple(a + b for a, b in zip(previous, totals))
+    return sorted(
+        [(name, *totals) for name, totals in report.items()],
+        key=lambda row: (row[3], row[1]),
+        reverse=True,
+    )
+
+
+class UnexpectedSynchronizationError(Exception):
+    pass
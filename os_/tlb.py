@@ -0,0 +1,89 @@
+"""
+    Translation lookaside buffer of a CPU, used when TLB_ENTRIES > 0.
+
+    The MMU translates a page of the job a CPU runs through that CPU's
+    TLB before it goes to the job's PageTable, whose methods each take
+    a lock. A TLB holds up to TLB_ENTRIES (job id, page_num) -> frame
+    translations of valid pages, replaced by TLB_REPLACEMENT, LRU, FIFO
+    or Random.
+
+    The PageManager shoots translations down in every TLB whenever it
+    frees a frame, before the frame can be reassigned. It only frees
+    frames of jobs no CPU runs, and a CPU only translates pages of the
+    job it runs, so a TLB takes no lock. Every dict operation is atomic
+    on its own, and insert(...) evicts with single operations that
+    allow for an entry shot down in between.
+"""
+import random
+from collections import OrderedDict
+from os_.pcb import PCB
+
+
+class TLB:
+
+    __slots__ = [
+        'cpu_id', 'capacity', 'replacement', 'entries', 'random',
+        'hits', 'misses', 'shootdowns',
+    ]
+
+    REPLACEMENTS = ['LRU', 'FIFO', 'Random']
+
+    def __init__(self, cpu_id: int, capacity: int, replacement: str):
+        if replacement not in self.REPLACEMENTS:
+            raise UnexpectedTLBError(f'Unsupported TLB_REPLACEMENT {replacement}.')
+        self.cpu_id = cpu_id
+        self.capacity = capacity
+        self.replacement = replacement
+        # -- (job id, page_num) -> frame, least recently used / first inserted first -- #
+        self.entries = OrderedDict()
+        # -- Seeded, the event driver gives the same dumps every run -- #
+        self.random = random.Random(cpu_id)
+
+        # -- Metrics, every hit is a PageTable lock not taken -- #
+        self.hits = 0
+        self.misses = 0
+        self.shootdowns = 0
+
+    def __len__(self):
+        return self.entries.__len__()
+
+    def lookup(self, pcb: PCB, page_num: int) -> int:
+        """     The frame page_num of pcb is in, None on a miss.     """
+        key = (pcb.job_id, page_num)
+        frame = self.entries.get(key)
+        if frame is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.replacement == 'LRU':
+            try:
+                self.entries.move_to_end(key)
+            except KeyError:
+                pass
+        return frame
+
+    def insert(self, pcb: PCB, page_num: int, frame: int):
+        entries = self.entries
+        while len(entries) >= self.capacity:
+            try:
+                if self.replacement == 'Random':
+                    del entries[self.random.choice(list(entries))]
+                else:
+                    entries.popitem(last=False)
+            except (KeyError, IndexError):
+                # -- Shot down by the PageManager meanwhile -- #
+                continue
+        entries[(pcb.job_id, page_num)] = frame
+
+    def shoot_down(self, pcb: PCB, page_num: int):
+        if self.entries.pop((pcb.job_id, page_num), None) is not None:
+            self.shootdowns += 1
+
+    def flush(self, pcb: PCB):
+        """     Shoots down every translation of pcb.     """
+        for key in [key for key in list(self.entries) if key[0] == pcb.job_id]:
+            self.shoot_down(pcb, key[1])
+
+
+class UnexpectedTLBError(Exception):
+    pass
@@ -0,0 +1,219 @@
+"""
+    The Block Translator turns a job's instruction stream into
+    basic blocks of threaded Python code.
+
+    A block starts at the pc it is entered at and runs straight
+    through register operations until it reaches a branch or jump
+    (0x14, 0x15 - 0x1a), which ends the block. HLT and undefined
+    opcodes are never translated and are left to the interpreter.
+
+    Loads and stores are translated with a guard on the cache valid
+    bit of the page they touch. If the guard fails the block stops in
+    front of that instruction and the CPU falls back to the interpreter,
+    which raises the page fault / IO interrupt through the MMU exactly
+    as before, addresses outside the page table included. A store to
+    any page the block was built from also falls back. Blocks are only
+    built from, and only entered on, valid pages that were never
+    written to, so code that is modified at run time is always
+    interpreted. A page written back to RAM is clean again but still
+    written, its written bit is never cleared.
+
+    Blocks are kept per job and dropped with invalidate(...) once the
+    PageManager cleans the job's page table.
+"""
+from os_.cache import Cache
+from os_.config import DECODE_CACHE, PAGE_SIZE
+from os_.instruction import dispatch_key
+from os_.sync_print import sync_print
+
+TRANSLATOR_DEBUG = False
+
+
+class Block:
+
+    __slots__ = ['pc', 'length', 'pages', 'run', 'format_counts']
+
+    def __init__(self, pc: int, length: int, pages: tuple, run, format_counts: list):
+        self.pc = pc
+        self.length = length
+        self.pages = pages
+        self.run = run
+        # -- Instructions per format of the first n instructions, indexed by n retired -- #
+        self.format_counts = format_counts
+
+
+class BlockTranslator:
+
+    MAX_BLOCK_LENGTH = 64
+
+    __slots__ = ['blocks', 'blocks_translated', 'blocks_executed', 'fallbacks']
+
+    def __init__(self):
+        # -- job_id -> pc -> Block, a job's blocks go with one atomic pop -- #
+        self.blocks = dict()
+        self.blocks_translated = 0
+        self.blocks_executed = 0
+        self.fallbacks = 0
+
+    def get_block(self, job_id: str, pc: int, cache: Cache):
+        """
+            Returns the Block entered at pc, translating it on first
+            use. Returns None when nothing can be translated at pc.
+        """
+        job_blocks = self.blocks.get(job_id)
+        if job_blocks is None:
+            job_blocks = self.blocks.setdefault(job_id, dict())
+        try:
+            return job_blocks[pc]
+        except KeyError:
+            pass
+        block = self.translate(job_id=job_id, pc=pc, cache=cache)
+        if block is not None:
+            job_blocks[pc] = block
+            self.blocks_translated += 1
+        return block
+
+    def invalidate(self, job_id: str):
+        """     Drops the blocks of job_id, the job ended.     """
+        self.blocks.pop(job_id, None)
+
+    def translate(self, job_id: str, pc: int, cache: Cache):
+        lines = list()
+        code_pages = set()
+        format_counts = [(0, 0, 0, 0)]
+        address = pc
+        while address - pc < self.MAX_BLOCK_LENGTH:
+            page_num = address // PAGE_SIZE
+            if page_num >= len(cache) or cache.is_page_valid(index=page_num) is False or \
+                    cache.written[page_num] is True:
+                break
+            word = cache.read_page(page_num).read_page(address % PAGE_SIZE)
+            instruction = DECODE_CACHE.decode(word)
+            emit = OPCODES.get(instruction.key, None)
+            if emit is None:
+                break
+            code_pages.add(page_num)
+            lines.extend(emit(instruction, address, address - pc))
+            counts = list(format_counts[-1])
+            counts[instruction.format] += 1
+            format_counts.append(tuple(counts))
+            address += 1
+            if instruction.key in TERMINATORS:
+                break
+        if address == pc:
+            return None
+        if lines[-1].startswith('return') is False:
+            lines.append(f'return {address}, {address - pc}, False')
+        pages = tuple(sorted(code_pages))
+        entry = ' and '.join(f'v[{p}] and not w[{p}]' for p in pages)
+        lines.insert(0, f'if not ({entry}): return {pc}, 0, True')
+
+        source = 'def block(r, m, v, d, w):\n' + ''.join(f'    {line}\n' for line in lines)
+        sync_print(
+            f'DEBUG: [BlockTranslator] PID {job_id} pc {pc}\n{source}'
+        ) if TRANSLATOR_DEBUG is True else None
+        # -- Stores check the block's final code pages, c is looked up on every run -- #
+        namespace = {'c': frozenset(pages)}
+        exec(compile(source, f'<block {job_id}:{pc}>', 'exec'), namespace)
+        return Block(pc=pc, length=address - pc, pages=pages, run=namespace['block'], format_counts=format_counts)
+
+
+# ------------------------------------------------------------------- #
+# -- Code generators. Each takes (instruction, pc, index in block) -- #
+# -- and returns source lines. r = registers, m = cache pages,      -- #
+# -- v = cache valid bits, d = cache dirty bits, w = cache written  -- #
+# -- bits, c = code pages of the block.                             -- #
+# -- Blocks return (next pc, instructions retired, fall back).      -- #
+# ------------------------------------------------------------------- #
+
+def guard(word_address: str, pc: int, n: int) -> list:
+    return [
+        f'wa = {word_address}',
+        f'p = wa // {PAGE_SIZE}',
+        f'if not 0 <= p < len(v) or v[p] is False: return {pc}, {n}, True',
+    ]
+
+
+def write_guard(word_address: str, pc: int, n: int) -> list:
+    return guard(word_address, pc, n) + [
+        f'if p in c: return {pc}, {n}, True',
+    ]
+
+
+def arithmetic(operator: str):
+    # -- D-reg is taken from the address field, like the interpreter -- #
+    return lambda i, pc, n: [f'r[{i.address}] = r[{i.reg1}] {operator} r[{i.reg2}]']
+
+
+def immediate(operator: str):
+    return lambda i, pc, n: [f'r[{i.dstreg}] = r[{i.dstreg}] {operator} {i.address}']
+
+
+def branch(condition: str):
+    return lambda i, pc, n: [
+        f'return ({i.address // 4} if {condition.format(i=i)} else {pc + 1}), {n + 1}, False'
+    ]
+
+
+def store(i, pc, n) -> list:
+    return write_guard(f'r[{i.dstreg}] // 4', pc, n) + [
+        f'm[p].write_page(wa % {PAGE_SIZE}, r[{i.breg}])',
+        'd[p] = w[p] = True',
+    ]
+
+
+def load(i, pc, n) -> list:
+    # -- The interpreter discards the value read by LW -- #
+    return guard(f'r[{i.breg}] // 4', pc, n)
+
+
+def read(i, pc, n) -> list:
+    word_address = f'r[{i.reg2}] // 4' if i.address == 0 else f'{i.address // 4}'
+    return guard(word_address, pc, n) + [
+        f'r[{i.reg1}] = m[p].read_page(wa % {PAGE_SIZE})',
+    ]
+
+
+def write(i, pc, n) -> list:
+    word_address = f'{i.address // 4}' if i.reg1 == i.reg2 else f'r[{i.reg2}] // 4'
+    return write_guard(word_address, pc, n) + [
+        f'm[p].write_page(wa % {PAGE_SIZE}, r[{i.reg1}])',
+        'd[p] = w[p] = True',
+    ]
+
+
+OPCODES = {
+    # -- Arithmetic format -- #
+    dispatch_key(0x0, 0x4): lambda i, pc, n: [f'r[{i.reg1}] = r[{i.reg2}]'],
+    dispatch_key(0x0, 0x5): arithmetic('+'),
+    dispatch_key(0x0, 0x6): arithmetic('-'),
+    dispatch_key(0x0, 0x7): arithmetic('*'),
+    dispatch_key(0x0, 0x8): arithmetic('//'),
+    dispatch_key(0x0, 0x9): arithmetic('&'),
+    dispatch_key(0x0, 0xa): arithmetic('|'),
+    dispatch_key(0x0, 0x10): lambda i, pc, n: [f'r[{i.address}] = 1 if r[{i.reg1}] < r[{i.reg2}] else 0'],
+    # -- Conditional Branch and Immediate format -- #
+    dispatch_key(0x1, 0x2): store,
+    dispatch_key(0x1, 0x3): load,
+    dispatch_key(0x1, 0xb): lambda i, pc, n: [f'r[{i.dstreg}] = {i.address}'],
+    dispatch_key(0x1, 0xc): immediate('+'),
+    dispatch_key(0x1, 0xd): immediate('*'),
+    dispatch_key(0x1, 0xe): immediate('//'),
+    dispatch_key(0x1, 0xf): lambda i, pc, n: [f'r[{i.dstreg}] = {i.address}'],
+    dispatch_key(0x1, 0x11): lambda i, pc, n: [f'r[{i.dstreg}] = 1 if r[{i.breg}] < {i.address} else 0'],
+    dispatch_key(0x1, 0x15): branch('r[{i.breg}] == r[{i.dstreg}]'),
+    dispatch_key(0x1, 0x16): branch('r[{i.breg}] != r[{i.dstreg}]'),
+    dispatch_key(0x1, 0x17): branch('r[{i.breg}] == 0'),
+    dispatch_key(0x1, 0x18): branch('r[{i.breg}] != 0'),
+    dispatch_key(0x1, 0x19): branch('r[{i.breg}] > 0'),
+    dispatch_key(0x1, 0x1a): branch('r[{i.breg}] < 0'),
+    # -- Unconditional Jump format, HLT is left to the interpreter -- #
+    dispatch_key(0x2, 0x14): lambda i, pc, n: [f'return {i.address}, {n + 1}, False'],
+    # -- Input and Output format -- #
+    dispatch_key(0x3, 0x0): read,
+    dispatch_key(0x3, 0x1): write,
+}
+
+TERMINATORS = frozenset([
+    dispatch_key(0x1, opcode) for opcode in range(0x15, 0x1b)
+] + [dispatch_key(0x2, 0x14)])
@@ -0,0 +1,119 @@
+"""
+    Write-back daemon, trickles dirty cache pages to RAM ahead of HLT.
+
+    A job leaving a CPU with WRITE_BACK_THRESHOLD or more dirty cache
+    pages is queued for the daemon, which writes them to their frames
+    while the job waits or sits in a ready queue. With
+    WRITE_BACK_INTERVAL > 0 the daemon also sweeps every job not on a
+    CPU that often. MMU.write_to_ram(...) is then left with the pages
+    written since the job last left a CPU.
+
+    Pages go through PageManager.write_back_page(...), which is safe
+    against the job being dispatched, evicted or ended meanwhile.
+"""
+import threading
+from collections import deque
+from os_.kernel import Kernel
+from os_.page_manager import PageManager
+from os_.pcb import PCB
+from os_.config import RUNNING_STATE, statistics
+from os_.synchronization import synchronized
+from os_.sync_print import sync_print
+
+WriteBackDEBUG = False
+
+
+class WriteBackDaemon:
+
+    __slots__ = [
+        'kernel', 'page_manager', 'threshold', 'interval', '__is_running',
+        'pending', 'ready', 'last_sweep',
+        'jobs_queued', 'flushes', 'sweeps', 'pages_written', 'latency', 'max_latency',
+        '__weakref__',
+    ]
+
+    def __init__(self, kernel: Kernel, page_manager: PageManager, threshold: int, interval: float):
+        self.kernel = kernel
+        self.page_manager = page_manager
+        self.threshold = threshold
+        self.interval = interval
+        self.__is_running = True
+        # -- (PCB, time it left its CPU), oldest first -- #
+        self.pending = deque()
+        self.ready = threading.Condition()
+        self.last_sweep = statistics.clock()
+
+        # -- Metrics, latency from leaving a CPU to written back, on the statistics clock -- #
+        self.jobs_queued = 0
+        self.flushes = 0
+        self.sweeps = 0
+        self.pages_written = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+
+    def switched_out(self, pcb: PCB):
+        """     pcb left its CPU, queues it when it holds WRITE_BACK_THRESHOLD dirty pages.     """
+        if self.threshold <= 0:
+            return
+        if len(pcb.cpu_state.get_cache().get_dirty_pages()) < self.threshold:
+            return
+        with self.ready:
+            self.pending.append((pcb, statistics.clock()))
+            self.jobs_queued += 1
+            self.ready.notify()
+
+    def start_daemon(self):
+        while self.__is_running:
+            with self.ready:
+                self.ready.wait_for(
+                    lambda: self.pending or not self.__is_running,
+                    timeout=self.interval if self.interval > 0 else None,
+                )
+            self.service()
+
+    def service(self) -> int:
+        """     Writes back the queued jobs, and sweeps if the interval passed, returns the page count.     """
+        written = 0
+        while self.pending:
+            with self.ready:
+                pcb, switched_out = self.pending.popleft()
+            written += self.flush(pcb)
+            waited = statistics.clock() - switched_out
+            self.latency += waited
+            self.max_latency = max(self.max_latency, waited)
+        if self.interval > 0 and statistics.clock() - self.last_sweep >= self.interval:
+            written += self.sweep()
+        return written
+
+    def sweep(self) -> int:
+        self.last_sweep = statistics.clock()
+        self.sweeps += 1
+        written = 0
+        for pcb in self.kernel.get_pcbs():
+            if pcb.get_state() != RUNNING_STATE:
+                written += self.flush(pcb)
+        return written
+
+    def flush(self, pcb: PCB) -> int:
+        dirty_pages = pcb.cpu_state.get_cache().get_dirty_pages()
+        if not dirty_pages:
+            return 0
+        written = 0
+        for page_num in dirty_pages:
+            if self.page_manager.write_back_page(pcb, page_num) is True:
+                written += 1
+        self.flushes += 1
+        self.pages_written += written
+        sync_print(
+            f'DEBUG: [WriteBack] Wrote {written} pages of PID {pcb.job_id} back.'
+        ) if WriteBackDEBUG is True else None
+        return written
+
+    def get_mean_latency(self) -> float:
+        return self.latency / self.jobs_queued if self.jobs_queued > 0 else 0.0
+
+    @synchronized
+    def end_daemon(self):
+        self.__is_running = False
+        with self.ready:
+            self.ready.notify_all()